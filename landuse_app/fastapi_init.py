@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
@@ -5,6 +8,8 @@ from loguru import logger
 
 from landuse_app import config
 from landuse_app.handlers import list_of_routes
+from landuse_app.logic.api import urban_db_api
+from storage.caching import caching_service
 
 logger.add(
     f'{config.get("LOG_FILE")}.log', colorize=False, backtrace=True, diagnose=True
@@ -18,6 +23,15 @@ def bind_routes(application: FastAPI, prefix: str) -> None:
         application.include_router(route, prefix=(prefix if "/" not in {r.path for r in route.routes} else ""))
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # stale cache files are removed in the background, without delaying the startup
+    sweep = asyncio.create_task(asyncio.to_thread(caching_service.sweep_all))
+    yield
+    await sweep
+    await urban_db_api.close()
+
+
 def get_app(prefix: str = "/api") -> FastAPI:
     """Create application and all dependable objects."""
 
@@ -30,6 +44,7 @@ def get_app(prefix: str = "/api") -> FastAPI:
         version=f"{config.get("VERSION")} ({config.get("LAST_UPDATE")})",
         terms_of_service="http://swagger.io/terms/",
         license_info={"name": "Apache 2.0", "url": "http://www.apache.org/licenses/LICENSE-2.0.html"},
+        lifespan=lifespan,
     )
     bind_routes(application, prefix)
 
@@ -1,5 +1,6 @@
 """Main landuse handlers are defined here."""
 from fastapi import Path, Query
+from fastapi.responses import ORJSONResponse
 
 from ..exceptions.http_exception_wrapper import http_exception
 from ..logic import landuse_service
@@ -30,7 +31,7 @@ async def get_projects_renovation_potential(
             f"Invalid source. Valid sources are: {', '.join(VALID_SOURCES)}",
             source
         )
-    return await landuse_service.get_renovation_potential(project_id, source=source)
+    return ORJSONResponse(await landuse_service.get_renovation_potential(project_id, source=source))
 
 
 @urbanization_router.get(
@@ -53,7 +54,7 @@ async def get_projects_urbanization_level(
             f"Invalid source. Valid sources are: {', '.join(VALID_SOURCES)}",
             source
         )
-    return await landuse_service.get_urbanization_level(project_id, source=source)
+    return ORJSONResponse(await landuse_service.get_urbanization_level(project_id, source=source))
 
 
 @renovation_router.get(
@@ -76,7 +77,7 @@ async def get_projects_context_renovation_potential(
             f"Invalid source. Valid sources are: {', '.join(VALID_SOURCES)}",
             source
         )
-    return await landuse_service.get_context_renovation_potential(project_id, source=source)
+    return ORJSONResponse(await landuse_service.get_context_renovation_potential(project_id, source=source))
 
 
 @urbanization_router.get(
@@ -99,7 +100,7 @@ async def get_projects_context_urbanization_level(
             f"Invalid source. Valid sources are: {', '.join(VALID_SOURCES)}",
             source
         )
-    return await landuse_service.get_context_urbanization_level(project_id, source=source)
+    return ORJSONResponse(await landuse_service.get_context_urbanization_level(project_id, source=source))
 
 
 @landuse_percentages_router.get(
@@ -1,3 +1,3 @@
-from .urban_db_api_gateway import urban_db_api
+from .urban_db_api_gateway import SharedTask, urban_db_api
 
-__all__ = ["urban_db_api"]
+__all__ = ["SharedTask", "urban_db_api"]
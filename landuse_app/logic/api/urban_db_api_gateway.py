@@ -1,7 +1,10 @@
+import asyncio
 import time
+from collections import OrderedDict
 import aiohttp
 import logging
 import jwt
+import orjson
 from fastapi import HTTPException
 
 from landuse_app import config
@@ -9,6 +12,35 @@ from storage.caching import caching_service
 
 logger = logging.getLogger(__name__)
 
+# responses remembered for If-None-Match revalidation: at most this many, with at most this many
+# response bytes in total, each for at most this many seconds; least recently used ones are evicted first
+_ETAG_CACHE_SIZE = 512
+_ETAG_CACHE_BYTES = 16 * 1024 * 1024
+_ETAG_TTL = 600.0
+
+
+class SharedTask:
+    """
+    A task awaited by several callers. A cancelled caller does not cancel it for the others, but once
+    every caller waiting for it has been cancelled the task is cancelled too and marked abandoned,
+    so that nobody joins it anymore.
+    """
+
+    def __init__(self, coro):
+        self.task = asyncio.ensure_future(coro)
+        self.abandoned = False
+        self._waiters = 0
+
+    async def wait(self):
+        self._waiters += 1
+        try:
+            return await asyncio.shield(self.task)
+        finally:
+            self._waiters -= 1
+            if self._waiters == 0 and not self.task.done():
+                self.abandoned = True
+                self.task.cancel()
+
 
 class AuthService:
     def __init__(self, auth_base_url: str):
@@ -126,6 +158,53 @@ class UrbanDbAPI:
         self.url = api_base
         self.auth = auth_service
         self.cache = cache_service
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        # key -> (etag, body, body size in bytes, expiry time)
+        self._etags: OrderedDict[tuple, tuple[str, dict, int, float]] = OrderedDict()
+        self._etag_bytes = 0
+        self._inflight: dict[tuple, SharedTask] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared session with a pooled connector, so keep-alive connections are reused
+        between requests. It is created lazily, inside the running event loop; a session left from
+        another event loop is closed before it is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            await self._close_stale_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=300, connect=10),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _close_stale_session(self) -> None:
+        stale, stale_loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if stale_loop is not None and stale_loop.is_running():
+            # the loop still runs in another thread, so the session is closed there
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(stale.close(), stale_loop))
+        else:
+            await stale.close()
+
+    @staticmethod
+    async def _read_json(resp: aiohttp.ClientResponse) -> dict | list | None:
+        """Parses the response body with orjson, which is much faster than json on large GeoJSON payloads."""
+        body = await resp.read()
+        return orjson.loads(body) if body.strip() else None
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
 
     async def _prepare_headers(self, use_token: bool = True, override_token: str | None = None) -> dict:
         headers: dict[str,str] = {}
@@ -136,7 +215,29 @@ class UrbanDbAPI:
             headers["Authorization"] = f"Bearer {token}"
         return headers
 
-    async def get(self, path: str, params: dict = None, ignore_404: bool = False) -> dict | None:
+    async def get(self, path: str, params: dict = None, ignore_404: bool = False, use_etag: bool = False) -> dict | None:
+        """
+        Async GET-request.
+        - ignore_404 – return None instead of raising on 404
+        - use_etag – remember the response ETag and revalidate with If-None-Match, a 304 returns the remembered body
+
+        Concurrent identical requests are coalesced: they all await the one request already in flight,
+        which is cancelled only when all of them are.
+        The returned data is shared between callers and the response cache, so it must not be modified.
+        """
+        key = (path, tuple(sorted((params or {}).items())), ignore_404, use_etag)
+        request = self._inflight.get(key)
+        if request is None or request.abandoned:
+            request = self._inflight[key] = SharedTask(self._get(path, params, ignore_404, use_etag))
+
+            def _forget(_: asyncio.Task, request: SharedTask = request) -> None:
+                if self._inflight.get(key) is request:
+                    del self._inflight[key]
+
+            request.task.add_done_callback(_forget)
+        return await request.wait()
+
+    async def _get(self, path: str, params: dict | None, ignore_404: bool, use_etag: bool) -> dict | None:
         headers = await self._prepare_headers()
         key = path.strip("/").replace("/", "_")
         if self.cache:
@@ -145,19 +246,56 @@ class UrbanDbAPI:
                 logger.info("Using cache for %s", path)
                 return self.cache.load_cache(recent)
 
+        etag_key = (path, tuple(sorted((params or {}).items())))
+        validated = self._lookup_etag(etag_key) if use_etag else None
+        if validated is not None:
+            headers["If-None-Match"] = validated[0]
+
         url = f"{self.url}{path}"
-        async with aiohttp.ClientSession() as sess:
-            async with sess.get(url, params=params, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if self.cache:
-                        self.cache.save_with_cleanup(data, key, params or {})
-                    return data
-                if ignore_404 and resp.status == 404:
-                    return None
-                text = await resp.text()
-                logger.error("GET %s failed: %s", path, text)
-                raise HTTPException(resp.status, f"Urban API GET error: {text}")
+        session = await self._get_session()
+        async with session.get(url, params=params, headers=headers) as resp:
+            if resp.status == 304 and validated is not None:
+                self._etags.move_to_end(etag_key)
+                return validated[1]
+            if resp.status == 200:
+                data = await self._read_json(resp)
+                if self.cache:
+                    self.cache.save_with_cleanup(data, key, params or {})
+                if use_etag and "ETag" in resp.headers:
+                    # read() returns the body already read by _read_json
+                    self._remember_etag(etag_key, resp.headers["ETag"], data, len(await resp.read()))
+                return data
+            self._forget_etag(etag_key)
+            if ignore_404 and resp.status == 404:
+                return None
+            text = await resp.text()
+            logger.error("GET %s failed: %s", path, text)
+            raise HTTPException(resp.status, f"Urban API GET error: {text}")
+
+    def _lookup_etag(self, key: tuple) -> tuple[str, dict, int, float] | None:
+        entry = self._etags.get(key)
+        if entry is not None and entry[3] <= time.monotonic():
+            self._forget_etag(key)
+            return None
+        return entry
+
+    def _remember_etag(self, key: tuple, etag: str, data: dict, size: int) -> None:
+        self._forget_etag(key)
+        if size > _ETAG_CACHE_BYTES:
+            return
+        now = time.monotonic()
+        for stale_key in [k for k, entry in self._etags.items() if entry[3] <= now]:
+            self._forget_etag(stale_key)
+        self._etags[key] = (etag, data, size, now + _ETAG_TTL)
+        self._etag_bytes += size
+        while len(self._etags) > _ETAG_CACHE_SIZE or self._etag_bytes > _ETAG_CACHE_BYTES:
+            _, evicted = self._etags.popitem(last=False)
+            self._etag_bytes -= evicted[2]
+
+    def _forget_etag(self, key: tuple) -> None:
+        entry = self._etags.pop(key, None)
+        if entry is not None:
+            self._etag_bytes -= entry[2]
 
     async def put(
         self,
@@ -173,7 +311,9 @@ class UrbanDbAPI:
         - extra_headers – any additional headers
         - use_token, override_token – default logic from AuthService
         """
-        headers = dict(extra_headers) if extra_headers else {}
+        headers = {"Content-Type": "application/json"}
+        if extra_headers:
+            headers.update(extra_headers)
 
         if override_token:
             headers["Authorization"] = f"Bearer {override_token}"
@@ -182,13 +322,15 @@ class UrbanDbAPI:
             headers["Authorization"] = f"Bearer {token}"
 
         url = f"{self.url}{path}"
-        async with aiohttp.ClientSession() as sess:
-            async with sess.put(url, json=data, headers=headers) as resp:
-                if resp.status in (200, 201):
-                    return await resp.json()
-                text = await resp.text()
-                logger.error("PUT %s failed: %s", path, text)
-                raise HTTPException(resp.status, f"Urban API PUT error: {text}")
+        # numpy scalars from the calculations are serialized as plain numbers
+        body = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY) if data is not None else None
+        session = await self._get_session()
+        async with session.put(url, data=body, headers=headers) as resp:
+            if resp.status in (200, 201):
+                return await self._read_json(resp)
+            text = await resp.text()
+            logger.error("PUT %s failed: %s", path, text)
+            raise HTTPException(resp.status, f"Urban API PUT error: {text}")
 
 
 auth_svc = AuthService(auth_base_url=config.get("AUTH_SERVICE_URL"))
@@ -1,4 +1,5 @@
 """Service created for calculations related to indicators"""
+import asyncio
 from datetime import datetime
 
 from loguru import logger
@@ -7,7 +8,7 @@ from landuse_app.exceptions.http_exception_wrapper import http_exception
 from landuse_app.logic.helpers.spatial_methods import SpatialMethods
 from landuse_app.logic.helpers.urban_api_access import get_territory_boundaries, put_indicator_value, get_service_count, \
     get_service_type_id_through_indicator, check_indicator_exists, get_projects_territory, \
-    check_project_indicator_exist, put_project_indicator, get_indicator_values, get_target_cities, \
+    check_scenario_indicator_exist, put_project_indicator, get_indicator_values, iter_target_cities, \
     get_physical_objects_without_geometry, get_services_geojson, \
     get_functional_zones_geojson_territory_id
 
@@ -70,21 +71,22 @@ class IndicatorsService:
     @staticmethod
     async def calculate_project_territory_area(project_id: int, force_recalculate: bool = False) -> dict:
         logger.info(f"Started calculation for project id {project_id}")
+        territory_data = await get_projects_territory(project_id)
+        territory_gdf = await SpatialMethods.to_project_gdf(territory_data)
+        scenario_id = territory_gdf["scenario_id"].loc[0]
+        territory_id = territory_gdf["territory_id"].loc[0]
+
+        # the territory already names the base scenario, so the indicator check needs no scenario lookup
         if not force_recalculate:
-            existing_indicator = await check_project_indicator_exist(project_id, indicator_id=4)
+            existing_indicator = await check_scenario_indicator_exist(int(scenario_id), indicator_id=4)
             if existing_indicator is not None:
                 logger.info(f"Indicator already exists in Urban DB, returning existing value")
                 return existing_indicator
-        territory_data = await get_projects_territory(project_id)
-        territory_gdf = await SpatialMethods.to_project_gdf(territory_data)
 
         geom = territory_gdf.geometry.iloc[0]
         area_km2 = await SpatialMethods.compute_area(geom)
         area_km2 = round(area_km2, 2)
 
-        scenario_id = territory_gdf["scenario_id"].loc[0]
-        territory_id = territory_gdf["territory_id"].loc[0]
-
         payload = {
             "indicator_id": 4,
             "scenario_id": int(scenario_id),
@@ -111,22 +113,26 @@ class IndicatorsService:
                 logger.info("Existing density indicator found, returning it")
                 return existing
 
-        territory_data = await get_territory_boundaries(territory_id)
+        territory_data, population_data = await asyncio.gather(
+            get_territory_boundaries(territory_id),
+            get_indicator_values(territory_id, indicator_id=1)
+        )
         territory_gdf = await SpatialMethods.to_project_gdf(territory_data)
         gdf_utm = territory_gdf.to_crs(territory_gdf.estimate_utm_crs())
         area_km2 = gdf_utm.area.sum() / 1e6
 
-        population_data = await get_indicator_values(territory_id, indicator_id=1)
         if not population_data:
             http_exception(404, f"No population data for territory {territory_id}")
 
-        for rec in population_data:
-            rec["_upd"] = datetime.fromisoformat(rec["updated_at"].rstrip("Z"))
+        # the records are shared with the response cache, so they are only read here
+        def updated_at(rec: dict) -> datetime:
+            return datetime.fromisoformat(rec["updated_at"].rstrip("Z"))
+
         ros = [rec for rec in population_data if rec.get("information_source") == "РОССТАТ"]
         if ros:
-            chosen = max(ros, key=lambda r: r["_upd"])
+            chosen = max(ros, key=updated_at)
         else:
-            chosen = max(population_data, key=lambda r: r["_upd"])
+            chosen = max(population_data, key=updated_at)
             logger.info(f"Fallback population source: '{chosen['information_source']}' on {chosen['date_value']}")
 
         population = float(chosen["value"])
@@ -156,8 +162,10 @@ class IndicatorsService:
                 return existing
 
         logger.info(f"Started calculation for territory {territory_id}")
-        cities_response = await get_target_cities(territory_id)
-        count = sum(1 for item in cities_response if item.get("target_city_type") is not None)
+        count = 0
+        async for item in iter_target_cities(territory_id):
+            if item.get("target_city_type") is not None:
+                count += 1
         payload = {
             "indicator_id": 349,
             "territory_id": territory_id,
@@ -299,12 +307,14 @@ class IndicatorsService:
             if existing is not None:
                 logger.info("Existing density indicator found, returning it")
                 return existing
-        territory_data = await get_territory_boundaries(territory_id)
+        territory_data, nature_objects = await asyncio.gather(
+            get_territory_boundaries(territory_id),
+            get_services_geojson(territory_id, service_type_id=4)
+        )
         territory_gdf = await SpatialMethods.to_project_gdf(territory_data)
         gdf_utm = territory_gdf.to_crs(territory_gdf.estimate_utm_crs())
         area_km2 = gdf_utm.area.sum() / 1e6
 
-        nature_objects = await get_services_geojson(territory_id, service_type_id=4)
         features = nature_objects.get("features", [])
         if not features:
             recreation_part = 0.0
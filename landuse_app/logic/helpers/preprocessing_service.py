@@ -1,8 +1,13 @@
+import asyncio
 import random
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from loguru import logger
+from pyproj import CRS
 from shapely.geometry import shape
+from .spatial_methods import SpatialMethods
 from .urban_api_access import get_functional_zones_territory_id, get_physical_objects_from_territory_parallel, \
     get_all_physical_objects_geometries_scen_id_percentages, get_all_physical_objects_geometries, \
     get_functional_zones_scen_id_percentages, get_functional_zones_scenario_id, get_services_geojson
@@ -11,8 +16,9 @@ from ...exceptions.http_exception_wrapper import http_exception
 
 class PreProcessingService:
     @staticmethod
-    async def extract_physical_objects(project_id: int, is_context: bool, scenario_id_flag: bool = False) -> dict[
-        str, gpd.GeoDataFrame]:
+    async def extract_physical_objects(project_id: int, is_context: bool, scenario_id_flag: bool = False,
+                                       utm_crs: CRS | None = None, *,
+                                       base_scenario_id: int | None = None) -> dict[str, gpd.GeoDataFrame]:
         """
         Extracts and processes physical objects for a given project from GeoJson,
         handling geometries and object attributes.
@@ -22,16 +28,21 @@ class PreProcessingService:
             The ID of the project for which physical objects are to be extracted.
         is_context : bool
             Flag indicating whether to fetch context-based data.
+        utm_crs : CRS | None
+            Локальная UTM-проекция, если она уже известна; иначе оценивается по объектам.
+        base_scenario_id : int | None
+            Base scenario ID of the project if the caller already knows it, so it is not requested again.
 
         Returns:
         dict[str, gpd.GeoDataFrame]
-            Словарь с обработанным GeoDataFrame и площадями для водных, зелёных и лесных объектов.
+            Словарь с обработанным GeoDataFrame, площадями для водных, зелёных и лесных объектов
+            и использованной UTM-проекцией.
         """
         logger.info("Физические объекты загружаются")
         if scenario_id_flag:
             resp = await get_all_physical_objects_geometries_scen_id_percentages(project_id)
         else:
-            resp = await get_all_physical_objects_geometries(project_id, is_context)
+            resp = await get_all_physical_objects_geometries(project_id, is_context, scenario_id=base_scenario_id)
 
         all_data: list[dict] = []
         for feature in resp.get("features", []):
@@ -115,23 +126,25 @@ class PreProcessingService:
         logger.info("Физические объекты загружены")
         df = pd.DataFrame(all_data)
         gdf = gpd.GeoDataFrame(df, geometry="geometry", crs="EPSG:4326").drop_duplicates("physical_object_id")
-        gdf = gdf[gdf.geometry.type.isin(["Polygon", "MultiPolygon"])]
+        type_ids = shapely.get_type_id(gdf.geometry.values)
+        gdf = gdf[(type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)]
 
-        local_crs = gdf.estimate_utm_crs()
-        water = gdf[gdf['object_type_id'].isin([45, 2, 44])].to_crs(local_crs).area.sum()
-        green = gdf[gdf['object_type_id'].isin([47, 3])].to_crs(local_crs).area.sum()
-        forests = gdf[gdf['object_type_id'].isin([48])].to_crs(local_crs).area.sum()
+        local_crs = utm_crs if utm_crs is not None else SpatialMethods.estimate_utm_crs(gdf)
+        nature_gdf = gdf[gdf['object_type_id'].isin([45, 2, 44, 47, 3, 48])].to_crs(local_crs)
+        nature_areas = nature_gdf.area
+        nature_type_ids = nature_gdf['object_type_id']
 
         return {
             "physical_objects": gdf,
-            "water_objects": water,
-            "green_objects": green,
-            "forests": forests
+            "water_objects": nature_areas[nature_type_ids.isin([45, 2, 44])].sum(),
+            "green_objects": nature_areas[nature_type_ids.isin([47, 3])].sum(),
+            "forests": nature_areas[nature_type_ids.isin([48])].sum(),
+            "local_crs": local_crs
         }
 
     @staticmethod
-    async def extract_landuse(project_id: int, is_context: bool, scenario_id_flag: bool = False, source: str = None, ) \
-            -> gpd.GeoDataFrame:
+    async def extract_landuse(project_id: int, is_context: bool, scenario_id_flag: bool = False, source: str = None,
+                              *, base_scenario_id: int | None = None) -> gpd.GeoDataFrame:
         """
         Extracts functional zones polygons for a given project and returns them as a GeoDataFrame.
 
@@ -140,6 +153,8 @@ class PreProcessingService:
             The ID of the project for which land use data is to be extracted.
         is_context : bool
             Flag to determine if context-specific functional zones should be fetched.
+        base_scenario_id : int | None
+            Base scenario ID of the project if the caller already knows it, so it is not requested again.
 
         Returns:
         gpd.GeoDataFrame
@@ -154,43 +169,33 @@ class PreProcessingService:
         if scenario_id_flag:
             geojson_data = await get_functional_zones_scen_id_percentages(project_id)
         else:
-            geojson_data = await get_functional_zones_scenario_id(project_id, is_context)
+            geojson_data = await get_functional_zones_scenario_id(project_id, is_context,
+                                                                  scenario_id=base_scenario_id)
         logger.info("Функциональные зоны загружаются")
 
         features = geojson_data["features"]
-        geometries = []
-        for feature in features:
-            try:
-                geom = shape(feature["geometry"])
-                if not geom.is_valid:
-                    geom = geom.buffer(0)
-                geometries.append(geom)
-            except Exception as e:
-                logger.error(f"Error processing geometry: {e}")
-                geometries.append(None)
+        geometries = SpatialMethods.geometries_from_geojson([feature["geometry"] for feature in features])
+        invalid = ~shapely.is_valid(geometries) & ~shapely.is_missing(geometries)
+        geometries[invalid] = shapely.buffer(geometries[invalid], 0)
 
         properties = [feature["properties"] for feature in features]
         landuse_polygons = gpd.GeoDataFrame(properties, geometry=geometries, crs="EPSG:4326")
 
         if 'properties' in landuse_polygons.columns:
-            landuse_polygons['landuse_zone'] = landuse_polygons['properties'].apply(
-                lambda x: x.get('landuse_zon') if isinstance(x, dict) else None)
+            landuse_polygons['landuse_zone'] = PreProcessingService._normalize_column(
+                landuse_polygons['properties'], ['landuse_zon'])['landuse_zon']
 
         if 'functional_zone_type' in landuse_polygons.columns:
-            landuse_polygons['zone_type_id'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('id') if isinstance(x, dict) else None)
-            landuse_polygons['zone_type_name'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('name') if isinstance(x, dict) and x.get('name') != "unknown" else "residential"
-            )
-            landuse_polygons['zone_type_nickname'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('nickname') if isinstance(x, dict) and x.get('nickname') != "unknown" else "Жилая зона"
-            )
+            zone_types = PreProcessingService._normalize_column(
+                landuse_polygons['functional_zone_type'], ['id', 'nickname'])
+            landuse_polygons['zone_type_id'] = zone_types['id']
+            landuse_polygons['zone_type_nickname'] = zone_types['nickname'].where(
+                landuse_polygons['functional_zone_type'].map(lambda x: isinstance(x, dict)), "Жилая зона")
 
         if "territory" in landuse_polygons.columns:
-            landuse_polygons['zone_type_parent_territory_id'] = landuse_polygons['territory'].apply(
-                lambda x: x.get('id') if isinstance(x, dict) else None)
-            landuse_polygons['zone_type_parent_territory_name'] = landuse_polygons['territory'].apply(
-                lambda x: x.get('name') if isinstance(x, dict) else None)
+            territories = PreProcessingService._normalize_column(landuse_polygons['territory'], ['id', 'name'])
+            landuse_polygons['zone_type_parent_territory_id'] = territories['id']
+            landuse_polygons['zone_type_parent_territory_name'] = territories['name']
 
         landuse_polygons.drop(
             columns=['properties', 'functional_zone_type', 'territory', 'created_at', 'updated_at', 'zone_type_name'],
@@ -206,185 +211,169 @@ class PreProcessingService:
         return landuse_polygons
 
     @staticmethod
-    def parse_physical_object(obj: dict[str, any]) -> list[dict[str, any]]:
+    def _normalize_column(column: pd.Series, fields: list[str]) -> pd.DataFrame:
+        """
+        Flattens a column of nested dicts into a DataFrame aligned with the column index.
+        Values that are not dicts produce empty rows, missing fields are filled with NaN.
+        """
+        records = pd.json_normalize([value if isinstance(value, dict) else {} for value in column])
+        records = records.reindex(columns=fields)
+        records.index = column.index
+        return records
+
+    @staticmethod
+    def _storeys_from_levels(levels) -> float:
+        """
+        Converts the OSM building:levels tag to a number of storeys the way int() does,
+        values that are empty or cannot be converted give NaN.
+        """
+        if levels is None or levels != levels or not levels:
+            return np.nan
+        try:
+            return max(int(levels), 1)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def parse_physical_objects(raw_objects: list[dict[str, any]]) -> pd.DataFrame:
         """
-        Parses a single physical object from the API response into a structured dictionary
+        Parses physical objects from the API response into a flat DataFrame
         with geometry and additional attributes.
 
         This function:
-          - Parses the geometry and validates it.
-          - Determines the object's category (residential, non_residential, recreational, or other).
+          - Parses all geometries at once (validity is repaired in bulk by the caller).
+          - Marks objects with building information as residential.
           - Calculates the number of storeys if building information is present.
-          - Processes services if the object is non-residential.
 
-        Returns a list of dictionaries because one object may contain multiple services,
-        resulting in multiple rows (one per service) in the final dataset.
+        Services of the objects are not expanded here, the territory pipeline takes them
+        from the services endpoint instead.
 
         Parameters:
-            obj (dict): A dictionary representing a physical object from the API response.
+            raw_objects (list[dict]): Physical objects from the API response.
 
         Returns:
-            list[dict]: A list of parsed physical objects with geometry and attributes ready for GeoDataFrame.
+            pd.DataFrame: Parsed physical objects with geometry and attributes ready for GeoDataFrame.
         """
-        geometry_json = obj.get("geometry")
-        if not geometry_json:
-            return []
+        objects = pd.DataFrame(raw_objects)
+        if "geometry" not in objects.columns:
+            return pd.DataFrame()
+        objects = objects[objects["geometry"].map(lambda geom: isinstance(geom, dict) and bool(geom))]
+
+        geometries = SpatialMethods.geometries_from_geojson(objects["geometry"].tolist())
+        has_shape = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+        objects = objects[has_shape].reset_index(drop=True)
+        geometries = geometries[has_shape]
+
+        for column in ("physical_object_id", "physical_object_type", "name", "building"):
+            if column not in objects.columns:
+                objects[column] = None
+
+        object_types = PreProcessingService._normalize_column(
+            objects["physical_object_type"], ["name", "physical_object_type_id"]
+        )
+        buildings = PreProcessingService._normalize_column(
+            objects["building"],
+            ["floors", "properties.storeys_count", "properties.osm_data.building:levels",
+             "properties.living_area_official", "properties.living_area_modeled"]
+        )
+        has_building = objects["building"].map(lambda building: isinstance(building, dict) and bool(building))
+
+        floors = pd.to_numeric(buildings["floors"], errors="coerce")
+        storeys_count = pd.to_numeric(buildings["properties.storeys_count"], errors="coerce")
+        building_levels = buildings["properties.osm_data.building:levels"].map(PreProcessingService._storeys_from_levels)
+        final_floors = pd.Series(
+            np.where(floors > 0, floors, np.where(storeys_count > 0, storeys_count, building_levels)),
+            index=objects.index
+        )
+        missing_floors = has_building & final_floors.isna()
+        final_floors[missing_floors] = np.random.default_rng().integers(2, 6, missing_floors.sum())
 
-        try:
-            shp = shape(geometry_json)
-            if not shp.is_valid:
-                shp = shp.buffer(0)
-            if shp.is_empty:
-                return []
-        except Exception as e:
-            logger.error(f"Error creating geometry: {e}")
-            return []
-
-        object_data = {
-            "physical_object_id": obj.get("physical_object_id"),
-            "object_type": obj.get("physical_object_type", {}).get("name", "Unknown"),
-            "object_type_id": obj.get("physical_object_type", {}).get("physical_object_type_id"),
-            "name": obj.get("name", "(unnamed)"),
-            "geometry_type": shp.geom_type,
-            "geometry": shp,
-            "category": None,
-            "storeys_count": None,
-            "living_area": None,
+        living_area_official = buildings["properties.living_area_official"]
+        living_area = living_area_official.where(
+            living_area_official.notna() & (living_area_official != 0),
+            buildings["properties.living_area_modeled"]
+        )
+
+        return pd.DataFrame({
+            "physical_object_id": objects["physical_object_id"],
+            "object_type": object_types["name"].fillna("Unknown"),
+            "object_type_id": object_types["physical_object_type_id"],
+            "name": objects["name"].fillna("(unnamed)"),
+            "geometry_type": gpd.GeoSeries(geometries, index=objects.index).geom_type,
+            "geometry": geometries,
+            "category": np.where(has_building, "residential", None),
+            "storeys_count": final_floors.where(has_building),
+            "living_area": living_area.where(has_building),
             "service_id": None,
             "service_name": None,
-        }
-
-        building = obj.get("building")
-        if building:
-            building_props = building.get("properties", {})
-            osm_data = building_props.get("osm_data", {})
-
-            floors = building.get("floors")
-            storeys_count = building_props.get("storeys_count")
-            building_levels = osm_data.get("building:levels")
-
-            if floors is not None and floors > 0:
-                final_floors = floors
-            elif storeys_count is not None and storeys_count > 0:
-                final_floors = storeys_count
-            elif building_levels:
-                try:
-                    num = int(building_levels)
-                    final_floors = max(num, 1)
-                except ValueError:
-                    final_floors = random.randint(2, 5)
-            else:
-                final_floors = random.randint(2, 5)
-
-            object_data.update({
-                "category": "residential",
-                "storeys_count": final_floors,
-                "living_area": (
-                        building_props.get("living_area_official")
-                        or building_props.get("living_area_modeled")
-                ),
-            })
-
-        services = obj.get("services", [])
-        if services:
-            parsed = []
-            for svc in services:
-                svc_type = svc.get("service_type", {}) or {}
-                sid = svc_type.get("id", "Unknown")
-                sname = svc_type.get("name", "Unknown")
-                cap_real = svc.get("is_capacity_real")
-
-                row = object_data.copy()
-                row.update({
-                    "category": "non_residential",
-                    "service_id": sid,
-                    "service_name": sname,
-                    "is_capacity_real": cap_real,
-                    "object_type": sname,
-                })
-                parsed.append(row)
-
-        # elif object_data["object_type_id"] == 5:
-        #     services = obj.get("services", [])
-        #     if services:
-        #         parsed = []
-        #         for service in services:
-        #             tmp = object_data.copy()
-        #             tmp["category"] = "non_residential"
-        #             tmp["service_id"] = service.get("service_id")
-        #             tmp["service_name"] = service.get("name")
-        #             tmp["is_capacity_real"] = service.get("is_capacity_real")
-        #             parsed.append(tmp)
-        #         return parsed
-        #     else:
-        #         object_data["category"] = "non_residential"
-
-        # elif object_data["object_type"] == "Рекреационная зона":
-        #     object_data["category"] = "recreational"
-        #
-        # else:
-        #     object_data["category"] = "other"
-
-        return [object_data]
+        })
 
     @staticmethod
-    async def extract_physical_objects_from_territory(territory_id: int) -> dict[str, gpd.GeoDataFrame]:
+    async def extract_physical_objects_from_territory(territory_id: int, utm_crs: CRS | None = None) \
+            -> dict[str, gpd.GeoDataFrame]:
         """
             Extracts and processes physical objects for a given territory using parallel API requests.
 
             This function:
               - Fetches physical objects with geometry for the specified territory via parallel paginated requests.
-              - Parses each object, extracting relevant attributes and geometry.
+              - Parses the objects column-wise, extracting relevant attributes and geometry.
               - Builds a GeoDataFrame from the parsed objects.
               - Separates water bodies, green areas, and forests for area calculations.
 
+            Parameters:
+                territory_id (int): The ID of the territory.
+                utm_crs (CRS | None): Local UTM CRS if already known, otherwise it is estimated from the objects.
+
             Returns:
                 dict[str, gpd.GeoDataFrame]: A dictionary containing:
-                    - "physical_objects": GeoDataFrame of all valid physical objects
+                    - "physical_objects": GeoDataFrame of all valid physical objects, projected to "local_crs"
                     - "water_objects": total area of water objects (in square meters)
                     - "green_objects": total area of green objects (in square meters)
                     - "forests": total area of forest objects (in square meters)
+                    - "local_crs": the UTM CRS used for the area calculations
             """
         logger.info("Physical objects are loading with parallel processing")
         raw_objects = await get_physical_objects_from_territory_parallel(territory_id)
-        all_data = []
-
-        for obj in raw_objects:
-            parsed_objects = PreProcessingService.parse_physical_object(obj)
-            all_data.extend(parsed_objects)
-        if not all_data:
-            raise http_exception(404, "No physical objects found for territory ID", territory_id)
-
-        logger.success("Physical objects are loaded, creating the  GeoDataFrame")
-        all_data_df = pd.DataFrame(all_data)
-        all_data_gdf = gpd.GeoDataFrame(all_data_df, geometry="geometry", crs="EPSG:4326")
-        all_data_gdf = all_data_gdf.drop_duplicates(subset='physical_object_id')
-        all_data_gdf = all_data_gdf.dropna(subset=['geometry'])
-        all_data_gdf = all_data_gdf[all_data_gdf.geometry.type.isin(['Polygon', 'MultiPolygon'])]
-        all_data_gdf = all_data_gdf[all_data_gdf.geometry.is_valid]
-        if len(all_data_gdf) < 1:
-            raise http_exception(404, "No polygonal physical objects found for territory ID", territory_id)
-        local_crs = all_data_gdf.estimate_utm_crs()
-
-        water_objects_gdf = all_data_gdf[
-            all_data_gdf['object_type_id'].isin([45, 2, 44])
-        ].to_crs(local_crs)
-
-        green_objects_gdf = all_data_gdf[
-            all_data_gdf['object_type_id'].isin([47, 3])
-        ].to_crs(local_crs)
-
-        forests_gdf = all_data_gdf[
-            all_data_gdf['object_type_id'].isin([48])
-        ].to_crs(local_crs)
-
-        logger.success("Physical objects are successfully loaded into GeoDataFrame")
-        return {
-            "physical_objects": all_data_gdf,
-            "water_objects": water_objects_gdf.area.sum(),
-            "green_objects": green_objects_gdf.area.sum(),
-            "forests": forests_gdf.area.sum()
-        }
+
+        def _process() -> dict[str, gpd.GeoDataFrame]:
+            all_data_df = PreProcessingService.parse_physical_objects(raw_objects)
+            if all_data_df.empty:
+                raise http_exception(404, "No physical objects found for territory ID", territory_id)
+
+            logger.success("Physical objects are loaded, creating the  GeoDataFrame")
+            all_data_df = all_data_df[~all_data_df["physical_object_id"].duplicated()]
+            all_data_gdf = gpd.GeoDataFrame(all_data_df, geometry="geometry", crs="EPSG:4326")
+            all_data_gdf = all_data_gdf.dropna(subset=['geometry'])
+            # buffer(0) rather than make_valid: it keeps spiked or self-touching footprints as polygons,
+            # make_valid turns them into GeometryCollections, which the type filter below would drop
+            geometries = all_data_gdf.geometry.values.copy()
+            invalid = ~shapely.is_valid(geometries)
+            geometries[invalid] = shapely.buffer(geometries[invalid], 0)
+            all_data_gdf["geometry"] = gpd.GeoSeries(geometries, index=all_data_gdf.index, crs=all_data_gdf.crs)
+            all_data_gdf = all_data_gdf[~all_data_gdf.geometry.is_empty]
+            type_ids = shapely.get_type_id(all_data_gdf.geometry.values)
+            all_data_gdf = all_data_gdf[
+                (type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)
+            ]
+            if len(all_data_gdf) < 1:
+                raise http_exception(404, "No polygonal physical objects found for territory ID", territory_id)
+            local_crs = utm_crs if utm_crs is not None else SpatialMethods.estimate_utm_crs(all_data_gdf)
+            all_data_gdf = all_data_gdf.to_crs(local_crs)
+
+            nature_gdf = all_data_gdf[all_data_gdf['object_type_id'].isin([45, 2, 44, 47, 3, 48])]
+            nature_areas = nature_gdf.area
+            nature_type_ids = nature_gdf['object_type_id']
+
+            logger.success("Physical objects are successfully loaded into GeoDataFrame")
+            return {
+                "physical_objects": all_data_gdf,
+                "water_objects": nature_areas[nature_type_ids.isin([45, 2, 44])].sum(),
+                "green_objects": nature_areas[nature_type_ids.isin([47, 3])].sum(),
+                "forests": nature_areas[nature_type_ids.isin([48])].sum(),
+                "local_crs": local_crs
+            }
+
+        return await asyncio.to_thread(_process)
 
     @staticmethod
     async def extract_landuse_from_territory(territory_id, source: str = None, ) \
@@ -411,58 +400,50 @@ class PreProcessingService:
         geojson_data = await get_functional_zones_territory_id(territory_id, source)
         logger.info("Functional zones are loading")
 
-        features = geojson_data
-        geometries = []
-        for feature in features:
-            try:
-                geom = shape(feature["geometry"])
-                if not geom.is_valid:
-                    geom = geom.buffer(0)
-                geometries.append(geom)
-            except Exception as e:
-                logger.error(f"Error processing geometry: {e}")
-                geometries.append(None)
-
-        properties = [feature["properties"] for feature in features]
-        landuse_polygons = gpd.GeoDataFrame(properties, geometry=geometries, crs="EPSG:4326")
-
-        if 'properties' in landuse_polygons.columns:
-            landuse_polygons['landuse_zone'] = landuse_polygons['properties'].apply(
-                lambda x: x.get('landuse_zon') if isinstance(x, dict) else None)
-
-        if 'functional_zone_type' in landuse_polygons.columns:
-            landuse_polygons['zone_type_id'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('id') if isinstance(x, dict) else None)
-            landuse_polygons['zone_type_name'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('name') if isinstance(x, dict) and x.get('name') != "unknown" else "residential"
-            )
-            landuse_polygons['zone_type_nickname'] = landuse_polygons['functional_zone_type'].apply(
-                lambda x: x.get('nickname') if isinstance(x, dict) and x.get('nickname') != "unknown" else "Жилая зона"
+        def _process() -> gpd.GeoDataFrame:
+            features = geojson_data
+            geometries = SpatialMethods.geometries_from_geojson([feature["geometry"] for feature in features])
+            invalid = ~shapely.is_valid(geometries) & ~shapely.is_missing(geometries)
+            geometries[invalid] = shapely.buffer(geometries[invalid], 0)
+
+            properties = [feature["properties"] for feature in features]
+            landuse_polygons = gpd.GeoDataFrame(properties, geometry=geometries, crs="EPSG:4326")
+
+            if 'properties' in landuse_polygons.columns:
+                landuse_polygons['landuse_zone'] = PreProcessingService._normalize_column(
+                    landuse_polygons['properties'], ['landuse_zon'])['landuse_zon']
+
+            if 'functional_zone_type' in landuse_polygons.columns:
+                zone_types = PreProcessingService._normalize_column(
+                    landuse_polygons['functional_zone_type'], ['id', 'nickname'])
+                landuse_polygons['zone_type_id'] = zone_types['id']
+                landuse_polygons['zone_type_nickname'] = zone_types['nickname'].where(
+                landuse_polygons['functional_zone_type'].map(lambda x: isinstance(x, dict)), "Жилая зона")
+
+            if "territory" in landuse_polygons.columns:
+                territories = PreProcessingService._normalize_column(landuse_polygons['territory'], ['id', 'name'])
+                landuse_polygons['zone_type_parent_territory_id'] = territories['id']
+                landuse_polygons['zone_type_parent_territory_name'] = territories['name']
+
+            landuse_polygons.drop(
+                columns=['properties', 'functional_zone_type', 'territory', 'created_at', 'updated_at', 'zone_type_name'],
+                inplace=True, errors='ignore'
             )
 
-        if "territory" in landuse_polygons.columns:
-            landuse_polygons['zone_type_parent_territory_id'] = landuse_polygons['territory'].apply(
-                lambda x: x.get('id') if isinstance(x, dict) else None)
-            landuse_polygons['zone_type_parent_territory_name'] = landuse_polygons['territory'].apply(
-                lambda x: x.get('name') if isinstance(x, dict) else None)
+            landuse_polygons.replace({
+                "zone_type_name": {"unknown": "residential"},
+                "zone_type_nickname": {"unknown": "Жилая зона"}
+            }, inplace=True)
 
-        landuse_polygons.drop(
-            columns=['properties', 'functional_zone_type', 'territory', 'created_at', 'updated_at', 'zone_type_name'],
-            inplace=True, errors='ignore'
-        )
+            if 'landuse_zon' in landuse_polygons.columns:
+                landuse_polygons.rename(columns={'landuse_zon': 'landuse_zone'}, inplace=True)
 
-        landuse_polygons.replace({
-            "zone_type_name": {"unknown": "residential"},
-            "zone_type_nickname": {"unknown": "Жилая зона"}
-        }, inplace=True)
+            if 'landuse_zone' not in landuse_polygons.columns:
+                landuse_polygons['landuse_zone'] = 'Residential'
+            logger.success("Functional zones are loaded")
+            return landuse_polygons
 
-        if 'landuse_zon' in landuse_polygons.columns:
-            landuse_polygons.rename(columns={'landuse_zon': 'landuse_zone'}, inplace=True)
-
-        if 'landuse_zone' not in landuse_polygons.columns:
-            landuse_polygons['landuse_zone'] = 'Residential'
-        logger.success("Functional zones are loaded")
-        return landuse_polygons
+        return await asyncio.to_thread(_process)
 
     @staticmethod
     async def extract_services(
@@ -514,11 +495,7 @@ class PreProcessingService:
                 geom = None
 
             props = feat.get("properties", {})
-            svc_type = props.pop("service_type", {})
-            uf = svc_type.pop("urban_function", {})
-
-            territories = props.pop("territories", [])
-            terr = territories[0] if territories else {}
+            svc_type = props.get("service_type", {})
 
             flat = {"service_name": props.get("name"),
                     "capacity": props.get("capacity"),
@@ -530,8 +507,9 @@ class PreProcessingService:
 
         df = pd.DataFrame(records)
         gdf = gpd.GeoDataFrame(df, geometry="geometry", crs="EPSG:4326")
-        gdf = gdf.to_crs(gdf.estimate_utm_crs())
-        gdf = gdf[gdf.geometry.type.isin(['Polygon', 'MultiPolygon'])]
+        gdf = gdf.to_crs(SpatialMethods.estimate_utm_crs(gdf))
+        type_ids = shapely.get_type_id(gdf.geometry.values)
+        gdf = gdf[(type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)]
         gdf = gdf.drop(
             columns=[
                 'osm_id',
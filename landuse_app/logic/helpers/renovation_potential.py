@@ -1,12 +1,11 @@
-import json
 from typing import Optional
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 from loguru import logger
 from shapely import Polygon, MultiPolygon
 import asyncio
-from pandarallel import pandarallel
 from landuse_app.schemas import GeoJSON, Profile
 from storage.caching import caching_service
 from .interpretation_service import interpretation_service
@@ -16,8 +15,6 @@ from .urban_api_access import get_projects_base_scenario_id, get_functional_zone
 from ..constants.constants import actual_zone_mapping
 from ...exceptions.http_exception_wrapper import http_exception
 
-pandarallel.initialize(progress_bar=False, nb_workers=4)
-
 def calculate_building_percentages(buildings_gdf: gpd.GeoDataFrame) -> pd.Series:
     """
     Filters residential buildings and calculates the percentage distribution by building categories.
@@ -125,8 +122,12 @@ async def assign_development_type(landuse_polygons: gpd.GeoDataFrame) -> gpd.Geo
     landuse_polygons["Застройка"] = None
     landuse_polygons["Уровень урбанизации"] = None
 
-    development_values = landuse_polygons[development_types].apply(pd.to_numeric, errors="coerce")
-    landuse_polygons["Застройка"] = development_values.idxmax(axis=1).where(development_values.max(axis=1) > 0.0)
+    development_values = landuse_polygons[development_types].to_numpy()
+    landuse_polygons["Застройка"] = np.where(
+        development_values.max(axis=1) > 0.0,
+        np.asarray(development_types, dtype=object)[development_values.argmax(axis=1)],
+        None
+    )
 
     conditions = [
         (landuse_polygons["landuse_zone"] == "Residential") & (landuse_polygons["Многоэтажная"] > 30.00),
@@ -180,7 +181,7 @@ async def analyze_geojson_for_renovation_potential(
     Returns:
     GeoDataFrame: Processed data with updated calculations and columns.
     """
-    utm_crs = landuse_polygons.estimate_utm_crs()
+    utm_crs = SpatialMethods.estimate_utm_crs(landuse_polygons)
     landuse_polygons = landuse_polygons.to_crs(utm_crs)
     landuse_polygons["Площадь"] = landuse_polygons.geometry.area
     landuse_polygons["Потенциал"] = "Подлежащие реновации"
@@ -218,15 +219,17 @@ async def analyze_geojson_for_renovation_potential(
 def _calc_building_percentages_core(storeys: np.ndarray) -> dict[str, float]:
     """
     Вход — чистый numpy-массив чисел этажности (float, без NaN).
-    Возвращает dict с четырьмя категориями.
+    Возвращает dict с четырьмя категориями, корзины те же, что у pd.cut в calculate_building_percentages:
+    правая граница включается, неположительная этажность не учитывается, без зданий получаются NaN.
     """
+    storeys = storeys[storeys > 0]
     if storeys.size == 0:
-        return {"ИЖС": 0, "Малоэтажная": 0, "Среднеэтажная": 0, "Многоэтажная": 0}
+        return dict.fromkeys(["ИЖС", "Малоэтажная", "Среднеэтажная", "Многоэтажная"], np.nan)
 
     # бинарные границы
     bins = np.array([0, 2, 4, 8, np.inf], dtype=float)
-    # получаем индексы корзин
-    idx = np.searchsorted(bins, storeys, side="right") - 1
+    # получаем индексы корзин (0, 2], (2, 4], (4, 8], (8, inf]
+    idx = np.searchsorted(bins, storeys, side="left") - 1
     counts = np.bincount(idx, minlength=4)
     total = storeys.size
     pct = counts / total * 100
@@ -246,7 +249,7 @@ def calculate_building_percentages_optimized(buildings_gdf: gpd.GeoDataFrame) ->
     pd.Series: Series with percentages of categorized buildings.
     """
     if buildings_gdf.empty:
-        return pd.Series({"ИЖС": 0, "Малоэтажная": 0, "Среднеэтажная": 0, "Многоэтажная": 0})
+        return pd.Series({"ИЖС": 0, "Малоэтажная": 0, "Среднеэтажная": 0, "Многоэтажная": 0}, dtype=np.float32)
 
     mask = (
             (buildings_gdf["object_type"] == "Жилой дом") &
@@ -254,7 +257,7 @@ def calculate_building_percentages_optimized(buildings_gdf: gpd.GeoDataFrame) ->
     )
     arr = buildings_gdf.loc[mask, "storeys_count"].to_numpy(dtype=float)
     result = _calc_building_percentages_core(arr)
-    return pd.Series(result)
+    return pd.Series(result, dtype=np.float32)
 
 
 def calculate_profiled_by_criteria(
@@ -329,7 +332,7 @@ async def process_zones_with_bulk_update(
             All percentage values are clipped to the [0, 100] range.
     """
     def _sync_bulk(zones_gdf, phys_gdf, mapping):
-        utm_crs = zones_gdf.estimate_utm_crs()
+        utm_crs = SpatialMethods.estimate_utm_crs(zones_gdf)
         phys = phys_gdf.to_crs(utm_crs).copy()
         zones = zones_gdf.to_crs(utm_crs).copy().reset_index(drop=True)
 
@@ -345,12 +348,9 @@ async def process_zones_with_bulk_update(
 
         phys["object_area"] = phys.geometry.area
 
-        joined = gpd.sjoin(
-            phys,
-            zones[["zone_id", "geometry"]],
-            how="inner",
-            predicate="intersects"
-        )
+        obj_pos, zone_pos = zones.sindex.query(phys.geometry.values, predicate="intersects")
+        order = np.lexsort((zone_pos, obj_pos))
+        joined = phys.iloc[obj_pos[order]].assign(zone_id=zone_pos[order])
 
         if joined.empty:
             result = zones.copy()
@@ -364,7 +364,7 @@ async def process_zones_with_bulk_update(
 
         agg_list = []
         for zone_id, group in joined.groupby("zone_id"):
-            pct = calculate_building_percentages(group)
+            pct = calculate_building_percentages_optimized(group)
             criteria = mapping.get(zones.at[zone_id, "landuse_zone"], [])
             prof_pct = (
                 calculate_profiled_by_criteria(
@@ -395,6 +395,7 @@ async def process_zones_with_bulk_update(
             if c not in result.columns:
                 result[c] = 0.0
             result[c] = result[c].clip(0, 100)
+        result[metric_cols] = result[metric_cols].astype(np.float32, copy=False)
 
         return (
             result
@@ -410,6 +411,33 @@ async def process_zones_with_bulk_update(
     )
 
 
+def mark_protected_area_zones(zones: gpd.GeoDataFrame, physical_objects: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Marks zones touching protected natural areas (service 4) as not subject to renovation, and writes
+    "Высоко урбанизированная территория" to their "Процент урбанизации" column, which is created if missing.
+    Zones sharing a functional_zone_id with a touched zone are marked too.
+
+    Parameters:
+    zones (gpd.GeoDataFrame): Zones with "functional_zone_id" and "Потенциал" columns.
+    physical_objects (gpd.GeoDataFrame): Physical objects and services with a "service_id" column.
+
+    Returns:
+    gpd.GeoDataFrame: The same zones, updated in place.
+    """
+    oop_objects = physical_objects[physical_objects["service_id"] == 4]
+    if oop_objects.empty:
+        return zones
+    oop_objects = oop_objects.to_crs(zones.crs)
+    _, zone_pos = zones.sindex.query(oop_objects.geometry.values, predicate="intersects")
+    if len(zone_pos) > 0:
+        oop_zone_ids = zones["functional_zone_id"].to_numpy()[np.unique(zone_pos)]
+        oop_mask = zones["functional_zone_id"].isin(oop_zone_ids).to_numpy()
+        zones.iloc[np.flatnonzero(oop_mask), zones.columns.get_loc("Потенциал")] = "Не подлежащие реновации"
+        # a label write, so that the column is created as before; filter_response does not serve it
+        zones.loc[oop_mask, "Процент урбанизации"] = "Высоко урбанизированная территория"
+    return zones
+
+
 async def get_renovation_potential(
     project_id: int,
     is_context: bool,
@@ -445,6 +473,8 @@ async def get_renovation_potential(
 
     profile_key = str(profile) if profile is not None else "no_profile"
 
+    # with an explicit source the base scenario is only needed on a cache miss, the fetches resolve it then
+    base_scenario_id = None
     if source is None:
         base_scenario_id = await get_projects_base_scenario_id(project_id)
         source_data = await get_functional_zone_sources(base_scenario_id)
@@ -453,24 +483,30 @@ async def get_renovation_potential(
         source_key = source
 
     cache_name = f"renovation_potential_project-{project_id}_is_context-{is_context}"
-    cache_file = caching_service.get_recent_cache_file(cache_name, {"profile": profile_key, "source": source_key})
+    cache_file = caching_service.get_recent_cache_file(
+        cache_name, {"profile": profile_key, "source": source_key}, suffix=".pkl"
+    )
 
     if cache_file and caching_service.is_cache_valid(cache_file):
-        logger.info(f"Using cached renovation potential for project {project_id}")
-        cached_data = caching_service.load_cache(cache_file)
-        return gpd.GeoDataFrame.from_features(cached_data, crs="EPSG:4326")
+        cached_gdf = caching_service.load_geodataframe(cache_file)
+        if cached_gdf is not None:
+            logger.info(f"Using cached renovation potential for project {project_id}")
+            return cached_gdf
 
     physical_objects_dict, landuse_polygons = await asyncio.gather(
-        data_extraction.extract_physical_objects(project_id, is_context),
-        data_extraction.extract_landuse(project_id, is_context, scenario_id, source)
+        data_extraction.extract_physical_objects(project_id, is_context, base_scenario_id=base_scenario_id),
+        data_extraction.extract_landuse(project_id, is_context, scenario_id, source, base_scenario_id=base_scenario_id)
     )
     physical_objects = physical_objects_dict["physical_objects"]
-    utm_crs = physical_objects.estimate_utm_crs()
+    utm_crs = physical_objects_dict["local_crs"]
     physical_objects = physical_objects.to_crs(utm_crs)
     landuse_polygons = landuse_polygons.to_crs(utm_crs)
 
     logger.info("Функциональные зоны и физические объекты получены")
-    landuse_polygons = landuse_polygons[landuse_polygons.geometry.type.isin(['Polygon', 'MultiPolygon'])]
+    type_ids = shapely.get_type_id(landuse_polygons.geometry.values)
+    landuse_polygons = landuse_polygons[
+        (type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)
+    ]
     landuse_polygons["Процент профильных объектов"] = 0.0
     landuse_polygons["Любые здания /на зону"] = 0.0
     logger.info("Функциональные зоны и физические объекты отфильтрованы")
@@ -490,63 +526,46 @@ async def get_renovation_potential(
     zones = landuse_polygons_ren_pot.to_crs(utm_crs)
     zones["Converted"] = None
 
-    oop_objects = physical_objects[physical_objects["service_id"] == 4]
-    if not oop_objects.empty:
-        oop_objects = oop_objects.to_crs(zones.crs)
-        oop_join = gpd.sjoin(zones, oop_objects, how="inner", predicate="intersects")
-        if not oop_join.empty:
-            oop_zone_ids = oop_join["functional_zone_id"].unique()
-            zones.loc[zones["functional_zone_id"].isin(oop_zone_ids), "Потенциал"] = "Не подлежащие реновации"
-            zones.loc[zones["functional_zone_id"].isin(oop_zone_ids), "Процент урбанизации"] = "Высоко урбанизированная территория"
+    zones = mark_protected_area_zones(zones, physical_objects)
 
     non_renovated = zones[pd.isna(zones['Потенциал'])]
-    buffered_geometries = non_renovated.buffer(300)
-    buffered_gdf = gpd.GeoDataFrame(geometry=buffered_geometries, crs=zones.crs)
+    buffers = non_renovated.buffer(300, resolution=4).values
     renovated = zones[
         (zones['Потенциал'] == 'Подлежащие реновации')
         ]
+    renovated_geometries = renovated.geometry.values
 
-    joined = gpd.sjoin(
-        renovated,
-        buffered_gdf,
-        how='inner',
-        predicate='intersects'
-    )
-    if joined.empty:
+    renovated_pos, buffer_pos = shapely.STRtree(buffers).query(renovated_geometries, predicate='intersects')
+    if len(renovated_pos) == 0:
         logger.info("No intersections between buffers and polygons were found,"
                     " returning polygons without intersections")
         landuse_polygons_ren_pot = zones.to_crs(epsg=4326)
 
-        result_json = json.loads(landuse_polygons_ren_pot.to_json())
-        caching_service.save_with_cleanup(
-            result_json, cache_name,
+        caching_service.save_geodataframe(
+            landuse_polygons_ren_pot, cache_name,
             {"profile": profile_key,
              "source": source_key})
 
         return landuse_polygons_ren_pot
     else:
         try:
-            joined['intersection_area'] = joined.apply(
-                lambda row: row.geometry.intersection(
-                    buffered_gdf.loc[row.index_right].geometry
-                ).area if not row.geometry.intersection(buffered_gdf.loc[row.index_right].geometry).is_empty else 0,
-                axis=1
+            intersection_area = shapely.area(
+                shapely.intersection(renovated_geometries[renovated_pos], buffers[buffer_pos])
             )
         except Exception as e:
             raise http_exception(500, "Error while searching for intersections between buffers and polygons", e)
 
-    grouped = joined.groupby(joined.index)['intersection_area'].sum()
-    final_overlap_ratio = grouped / renovated.loc[grouped.index].geometry.area
-    to_update = final_overlap_ratio[final_overlap_ratio > 0.50].index
+    intersection_sums = np.bincount(renovated_pos, weights=intersection_area, minlength=len(renovated))
+    final_overlap_ratio = intersection_sums / shapely.area(renovated_geometries)
+    to_update = renovated.index[final_overlap_ratio > 0.50]
     mask_renovation = zones.index.isin(to_update)
     zones.loc[mask_renovation & zones['Потенциал'].notnull(), 'Потенциал'] = \
         'Не подлежащие реновации'
     zones.loc[to_update, 'Converted'] = True
     landuse_polygons_ren_pot = zones.to_crs(epsg=4326)
 
-    result_json = json.loads(landuse_polygons_ren_pot.to_json())
-    caching_service.save_with_cleanup(
-        result_json, cache_name,
+    caching_service.save_geodataframe(
+        landuse_polygons_ren_pot, cache_name,
         {"profile": profile_key,
          "source": source_key})
 
@@ -626,7 +645,7 @@ async def calculate_zone_percentages(scenario_id: int, is_context: bool = False,
     water_objects = physical_objects_dict["water_objects"]
     green_objects = physical_objects_dict["green_objects"]  # новое
     forests = physical_objects_dict["forests"]  # новое
-    utm_crs = landuse_polygons.estimate_utm_crs()
+    utm_crs = SpatialMethods.estimate_utm_crs(landuse_polygons)
     landuse_polygons = landuse_polygons.to_crs(utm_crs)
 
     landuse_polygons["landuse_zone"] = landuse_polygons["landuse_zone"].replace({None: "Residential", "null": "Residential"}).fillna("Residential")
@@ -689,7 +708,7 @@ async def get_projects_renovation_potential(project_id: int, source: str = None)
     landuse_polygons = await interpretation_service.interpret_urbanization_value(landuse_polygons)
     landuse_polygons = await interpretation_service.interpret_renovation_value(landuse_polygons)
     landuse_polygons = await filter_response(landuse_polygons, True)
-    geojson = GeoJSON.from_geodataframe(landuse_polygons)
+    geojson = GeoJSON.dict_from_geodataframe(landuse_polygons)
 
     response = {
         "geojson": geojson,
@@ -699,14 +718,14 @@ async def get_projects_renovation_potential(project_id: int, source: str = None)
     return response
 
 
-async def get_projects_urbanization_level(project_id: int, source: str = None) -> GeoJSON:
+async def get_projects_urbanization_level(project_id: int, source: str = None) -> dict:
     """Calculate urbanization level for project."""
     logger.info(f"Calculating urbanization level for project {project_id}")
     landuse_polygons = await get_renovation_potential(project_id, is_context=False, source=source)
     landuse_polygons = await interpretation_service.interpret_urbanization_value(landuse_polygons)
     landuse_polygons = await interpretation_service.interpret_renovation_value(landuse_polygons)
     landuse_polygons = await filter_response(landuse_polygons)
-    return GeoJSON.from_geodataframe(landuse_polygons)
+    return GeoJSON.dict_from_geodataframe(landuse_polygons)
 
 
 async def get_projects_context_renovation_potential(project_id: int, source: str = None) -> dict:
@@ -722,7 +741,7 @@ async def get_projects_context_renovation_potential(project_id: int, source: str
     landuse_polygons = await interpretation_service.interpret_urbanization_value(landuse_polygons)
     landuse_polygons = await interpretation_service.interpret_renovation_value(landuse_polygons)
     landuse_polygons = await filter_response(landuse_polygons, True)
-    geojson = GeoJSON.from_geodataframe(landuse_polygons)
+    geojson = GeoJSON.dict_from_geodataframe(landuse_polygons)
 
     response = {
         "geojson": geojson,
@@ -732,14 +751,14 @@ async def get_projects_context_renovation_potential(project_id: int, source: str
     return response
 
 
-async def get_projects_context_urbanization_level(project_id: int, source: str = None) -> GeoJSON:
+async def get_projects_context_urbanization_level(project_id: int, source: str = None) -> dict:
     """Calculate urbanization level for project's context."""
     logger.info(f"Calculating urbanization level for project {project_id}")
     landuse_polygons = await get_renovation_potential(project_id, is_context=True, source=source)
     landuse_polygons = await interpretation_service.interpret_urbanization_value(landuse_polygons)
     landuse_polygons = await interpretation_service.interpret_renovation_value(landuse_polygons)
     landuse_polygons = await filter_response(landuse_polygons)
-    return GeoJSON.from_geodataframe(landuse_polygons)
+    return GeoJSON.dict_from_geodataframe(landuse_polygons)
 
 
 async def get_projects_landuse_parts_scen_id_main_method(scenario_id: int, source: str = None) -> dict:
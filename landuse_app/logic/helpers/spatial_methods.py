@@ -1,14 +1,40 @@
+import json
+import math
+from functools import lru_cache
 from typing import Union
 
 import geopandas as gpd
 import asyncio
 
 import numpy as np
-from pyproj import CRS
+import pandas as pd
+import shapely
+import shapely.ops
+from pyproj import CRS, Transformer
 from pyproj.aoi import AreaOfInterest
 from pyproj.database import query_utm_crs_info
+from loguru import logger
+from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
-from shapely.wkt import loads, dumps
+
+
+@lru_cache(maxsize=4096)
+def _estimate_crs(lon_q: float, lat_q: float) -> CRS:
+    utm_crs_list = query_utm_crs_info(
+        datum_name="WGS 84",
+        area_of_interest=AreaOfInterest(
+            west_lon_degree=lon_q,
+            south_lat_degree=lat_q,
+            east_lon_degree=lon_q,
+            north_lat_degree=lat_q,
+        ),
+    )
+    return CRS.from_epsg(utm_crs_list[0].code)
+
+
+@lru_cache(maxsize=256)
+def _cached_transformer(utm_crs: CRS) -> Transformer:
+    return Transformer.from_crs("EPSG:4326", utm_crs, always_xy=True)
 
 
 class SpatialMethods:
@@ -27,34 +53,90 @@ class SpatialMethods:
         Returns:
             A GeoSeries with rounded geometries.
         """
-        return await asyncio.to_thread(
-            geometry.map,
-            lambda geom: loads(dumps(geom, rounding_precision=ndigits))
-        )
+        def _round() -> gpd.GeoSeries:
+            rounded = shapely.transform(np.asarray(geometry), lambda coords: np.round(coords, ndigits))
+            return gpd.GeoSeries(rounded, index=geometry.index, crs=geometry.crs)
+
+        if len(geometry) < 1000:
+            return _round()
+        return await asyncio.to_thread(_round)
 
     @staticmethod
     async def estimate_crs_for_bounds(minx, miny, maxx, maxy) -> CRS:
         x_center = np.mean([minx, maxx])
         y_center = np.mean([miny, maxy])
-        utm_crs_list = query_utm_crs_info(
-            datum_name="WGS 84",
-            area_of_interest=AreaOfInterest(
-                west_lon_degree=x_center,
-                south_lat_degree=y_center,
-                east_lon_degree=x_center,
-                north_lat_degree=y_center,
-            ),
-        )
-        crs = CRS.from_epsg(utm_crs_list[0].code)
-        return crs
+        # UTM zone and band edges lie on whole degrees, so the centre of the 1° cell resolves to the same zone
+        return _estimate_crs(math.floor(x_center) + 0.5, math.floor(y_center) + 0.5)
+
+    @staticmethod
+    def estimate_utm_crs(gdf: gpd.GeoDataFrame | gpd.GeoSeries) -> CRS:
+        """
+        Returns the same CRS as gdf.estimate_utm_crs(), which looks up the UTM zone of the bounds centre
+        in the PROJ database, but for geographic frames the lookup is memoized per 1° cell.
+        Frames in a projected CRS are delegated to geopandas.
+
+        Args:
+            gdf: GeoDataFrame or GeoSeries with a CRS set.
+
+        Returns:
+            The UTM CRS for the frame.
+        """
+        if gdf.crs is None or not gdf.crs.is_geographic:
+            return gdf.estimate_utm_crs()
+        minx, miny, maxx, maxy = gdf.total_bounds
+        return _estimate_crs(math.floor(np.mean([minx, maxx])) + 0.5, math.floor(np.mean([miny, maxy])) + 0.5)
 
     @staticmethod
     async def compute_area(geom):
         utm_crs = await SpatialMethods.estimate_crs_for_bounds(*geom.bounds)
-        gs = gpd.GeoSeries([geom], crs="EPSG:4326")
-        gs_utm = gs.to_crs(utm_crs)
-        area_m2 = gs_utm.area.iloc[0]
-        return area_m2 / 1_000_000
+        transformer = _cached_transformer(utm_crs)
+        projected = shapely.ops.transform(transformer.transform, geom)
+        return projected.area / 1_000_000
+
+    @staticmethod
+    def geometries_from_geojson(geometries_json: list[dict | None]) -> np.ndarray:
+        """
+        Parses GeoJSON geometry dicts in a single vectorized GEOS pass.
+        GEOS < 3.12 does not read Z coordinates from GeoJSON, so the rejected entries are retried with shape().
+
+        Args:
+            geometries_json: GeoJSON geometry dicts, empty entries are allowed.
+
+        Returns:
+            An object array of geometries, None where the geometry is missing or cannot be parsed.
+        """
+        geometries = shapely.from_geojson(
+            np.array([json.dumps(geom) for geom in geometries_json], dtype=object), on_invalid="ignore"
+        )
+        for i in np.flatnonzero(shapely.is_missing(geometries)):
+            if not geometries_json[i]:
+                continue
+            try:
+                geometries[i] = shape(geometries_json[i])
+            except Exception as e:
+                logger.error(f"Error creating geometry: {e}")
+        return geometries
+
+    @staticmethod
+    def from_features(features: dict | list[dict], crs: str | None = None) -> gpd.GeoDataFrame:
+        """
+        Builds a GeoDataFrame from a FeatureCollection dict or a list of features, like
+        GeoDataFrame.from_features, but parses all geometries at once and builds the
+        attribute frame in a single DataFrame constructor call.
+
+        Args:
+            features: FeatureCollection dict or list of GeoJSON features.
+            crs: CRS to assign to the result.
+
+        Returns:
+            A GeoDataFrame with the geometry column first followed by the feature properties.
+        """
+        if isinstance(features, dict):
+            features = features.get("features", [])
+        geometries = SpatialMethods.geometries_from_geojson([feature.get("geometry") for feature in features])
+        properties = pd.DataFrame([feature.get("properties") or {} for feature in features])
+        properties.insert(0, "geometry", gpd.GeoSeries(geometries, index=properties.index, crs=crs))
+        return gpd.GeoDataFrame(properties, geometry="geometry", crs=crs)
 
     @staticmethod
     async def to_project_gdf(data: Union[dict, list]) -> gpd.GeoDataFrame:
@@ -82,8 +164,7 @@ class SpatialMethods:
         else:
             raise ValueError("to_project_gdf: Unsupported input format")
 
-        gdf = gpd.GeoDataFrame.from_features(features)
-        gdf = gdf.set_crs("EPSG:4326")
+        gdf = SpatialMethods.from_features(features, crs="EPSG:4326")
 
         if "project" in gdf.columns:
             gdf["scenario_id"] = gdf["project"].apply(
@@ -1,26 +1,27 @@
-import json
 from datetime import datetime
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from loguru import logger
 import asyncio
-from pandarallel import pandarallel
+from pyproj import CRS
 
+from landuse_app.exceptions.http_exception_wrapper import http_exception
 from storage.caching import caching_service
 from .preprocessing_service import data_extraction
 from .renovation_potential import process_zones_with_bulk_update, \
     assign_development_type
+from .spatial_methods import SpatialMethods
 from .urban_api_access import get_functional_zone_sources_territory_id, \
     check_urbanization_indicator_exists, put_indicator_value
 from ..constants import actual_zone_mapping
 
-pandarallel.initialize(progress_bar=False, nb_workers=4)
-
 
 async def get_territory_renovation_potential(
         territory_id: int,
         source: str = None
-) -> gpd.GeoDataFrame:
+) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame | None]:
     """
     Calculate the renovation potential for a given project.
 
@@ -43,8 +44,9 @@ async def get_territory_renovation_potential(
 
     Returns:
     --------
-    gpd.GeoDataFrame
-        A GeoDataFrame containing the renovation potential analysis results with calculated attributes.
+    tuple[gpd.GeoDataFrame, gpd.GeoDataFrame | None]
+        The renovation potential analysis results with calculated attributes in EPSG:4326, and the same
+        zones in the local UTM CRS they were processed in (None when the result comes from cache).
     """
 
     if source is None:
@@ -54,44 +56,48 @@ async def get_territory_renovation_potential(
         source_key = source
 
     cache_name = f"renovation_potential_territory-{territory_id}"
-    cache_file = caching_service.get_recent_cache_file(cache_name, {"profile": "no_profile", "source": source_key})
+    cache_file = caching_service.get_recent_cache_file(
+        cache_name, {"profile": "no_profile", "source": source_key}, suffix=".pkl"
+    )
 
     if cache_file and caching_service.is_cache_valid(cache_file):
-        logger.info(f"Using cached renovation potential for project {territory_id}")
-        cached_data = caching_service.load_cache(cache_file)
-        return gpd.GeoDataFrame.from_features(cached_data, crs="EPSG:4326")
+        cached_gdf = caching_service.load_geodataframe(cache_file)
+        if cached_gdf is not None:
+            logger.info(f"Using cached renovation potential for project {territory_id}")
+            return cached_gdf, None
 
-    physical_objects_dict, landuse_polygons = await asyncio.gather(
+    physical_objects_dict, landuse_polygons, services_gdf = await asyncio.gather(
         data_extraction.extract_physical_objects_from_territory(territory_id),
-        data_extraction.extract_landuse_from_territory(territory_id, source)
+        data_extraction.extract_landuse_from_territory(territory_id, source),
+        data_extraction.extract_services(territory_id)
     )
     logger.success("Physical objects are loaded")
     physical_objects = physical_objects_dict["physical_objects"]
-    utm_crs = physical_objects.estimate_utm_crs()
-    physical_objects = physical_objects.to_crs(utm_crs)
+    utm_crs = physical_objects_dict["local_crs"]
     landuse_polygons = landuse_polygons.to_crs(utm_crs)
 
-    services_gdf = await data_extraction.extract_services(territory_id)
-    if services_gdf.empty:
-        combined_gdf = physical_objects.copy()
-    else:
+    if not services_gdf.empty:
         services_gdf = services_gdf.to_crs(physical_objects.crs)
 
-        combined_df = pd.concat(
-            [physical_objects, services_gdf],
-            ignore_index=True,
-            sort=False
-        )
-        combined_gdf = gpd.GeoDataFrame(
-            combined_df,
-            geometry="geometry",
+        # only these columns are read by the zone metrics and the high urbanization check below
+        columns = ["geometry", "object_type", "object_type_id", "storeys_count", "service_id", "service_type_id"]
+        physical_objects = gpd.GeoDataFrame(
+            pd.concat(
+                [physical_objects.reindex(columns=columns), services_gdf.reindex(columns=columns)],
+                ignore_index=True,
+                copy=False
+            ),
             crs=physical_objects.crs
         )
 
-        physical_objects = combined_gdf
-
     logger.success("Functional objects and physical objects are loaded")
-    landuse_polygons = landuse_polygons[landuse_polygons.geometry.type.isin(['Polygon', 'MultiPolygon'])]
+    type_ids = shapely.get_type_id(landuse_polygons.geometry.values)
+    landuse_polygons = landuse_polygons[
+        (type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)
+    ]
+    if landuse_polygons.empty:
+        raise http_exception(404, "No polygonal functional zones found for territory ID", territory_id)
+
     landuse_polygons["Процент профильных объектов"] = 0.0
     landuse_polygons["Любые здания /на зону"] = 0.0
     logger.success("Functional zones and physical objects are filtered")
@@ -103,45 +109,42 @@ async def get_territory_renovation_potential(
     landuse_polygons = await assign_development_type(landuse_polygons)
     logger.success("Urbanization level is calculated")
 
-    zones = landuse_polygons.to_crs(utm_crs)
-
-    high_obj_ids = {11, 61}
-    high_srv_ids = {4, 81}
+    zones = landuse_polygons
 
     if "service_type_id" in physical_objects.columns:
+        object_type_ids = physical_objects["object_type_id"].to_numpy()
+        service_type_ids = physical_objects["service_type_id"].to_numpy()
+        # object types 11, 61 and service types 4, 81 mark a zone as highly urbanized
         high_objs = physical_objects[
-            physical_objects["object_type_id"].isin(high_obj_ids) |
-            physical_objects["service_type_id"].isin(high_srv_ids)
+            (object_type_ids == 11) | (object_type_ids == 61) |
+            (service_type_ids == 4) | (service_type_ids == 81)
             ]
 
         if not high_objs.empty:
-            high_objs = high_objs.to_crs(zones.crs)
-            high_join = gpd.sjoin(
-                zones,
-                high_objs[["geometry"]],
-                how="inner",
-                predicate="intersects"
-            )
-
-            if not high_join.empty:
-                high_zone_ids = high_join.index.unique()
-
-                zones.loc[
-                    high_zone_ids,
-                    "Уровень урбанизации"
+            _, zone_pos = zones.sindex.query(high_objs.geometry.values, predicate="intersects")
+
+            if len(zone_pos) > 0:
+                high_zone_pos = np.unique(zone_pos)
+
+                zones.iloc[
+                    high_zone_pos,
+                    zones.columns.get_loc("Уровень урбанизации")
                 ] = "Высоко урбанизированная территория"
 
     landuse_polygons = zones.to_crs("EPSG:4326")
-    result_json = json.loads(landuse_polygons.to_json())
-    caching_service.save_with_cleanup(
-        result_json, cache_name,
+    caching_service.save_geodataframe(
+        landuse_polygons, cache_name,
         {"profile": "no_profile",
          "source": source_key})
 
-    return landuse_polygons
+    return landuse_polygons, zones
 
 
-async def compute_urbanization_indicator(polygons_gdf: gpd.GeoDataFrame, territory_id: int) -> dict:
+async def compute_urbanization_indicator(
+        polygons_gdf: gpd.GeoDataFrame,
+        territory_id: int,
+        utm_crs: CRS | None = None
+) -> dict:
     """
     Calculates the urbanization percentage for a given territory.
 
@@ -151,6 +154,10 @@ async def compute_urbanization_indicator(polygons_gdf: gpd.GeoDataFrame, territo
       - "Well urbanized territory"
       - "Highly urbanized territory"
 
+    Areas are measured in the polygons' own CRS when it is already projected. Otherwise only the geometry
+    column is reprojected, to utm_crs when it is passed (e.g. the CRS already used for the territory)
+    or to the UTM zone estimated from the polygons.
+
     Returns a dictionary in the following format:
       {
         "indicator_id": 16,
@@ -165,11 +172,14 @@ async def compute_urbanization_indicator(polygons_gdf: gpd.GeoDataFrame, territo
     if "Процент урбанизации" in polygons_gdf.columns:
         polygons_gdf = polygons_gdf.rename(columns={"Процент урбанизации": "Уровень урбанизации"})
 
-    if "Уровень урбанизации" not in polygons_gdf.columns:
+    if "Уровень урбанизации" not in polygons_gdf.columns or polygons_gdf.empty:
         percentage = 0.0
     else:
-        local_crs = polygons_gdf.estimate_utm_crs()
-        polygons_gdf_m = polygons_gdf.to_crs(local_crs)
+        if polygons_gdf.crs.is_projected:
+            geometry_m = polygons_gdf.geometry
+        else:
+            local_crs = utm_crs if utm_crs is not None else SpatialMethods.estimate_utm_crs(polygons_gdf)
+            geometry_m = polygons_gdf.geometry.to_crs(local_crs)
         good_levels = {
             "Средне урбанизированная территория",
             "Хорошо урбанизированная территория",
@@ -179,9 +189,12 @@ async def compute_urbanization_indicator(polygons_gdf: gpd.GeoDataFrame, territo
         # good_zones = polygons_gdf[polygons_gdf["Уровень урбанизации"].isin(good_levels)]
         # percentage = round((len(good_zones) / total_zones * 100) if total_zones > 0 else 0.0, 2)
 
-        mask_good = polygons_gdf_m["Уровень урбанизации"].isin(good_levels)
-        total_area = polygons_gdf_m.geometry.area.sum()
-        good_area = polygons_gdf_m.loc[mask_good, "geometry"].area.sum()
+        levels = polygons_gdf["Уровень урбанизации"].astype("category")
+        good_codes = np.flatnonzero(levels.cat.categories.isin(good_levels))
+        mask_good = np.isin(levels.cat.codes.to_numpy(), good_codes)
+        areas = geometry_m.area.to_numpy()
+        total_area = areas.sum()
+        good_area = areas[mask_good].sum()
 
         if total_area > 0:
             percentage = round((good_area / total_area) * 100, 2)
@@ -200,6 +213,12 @@ async def compute_urbanization_indicator(polygons_gdf: gpd.GeoDataFrame, territo
     return result
 
 
+def _discard_task(task: asyncio.Task) -> None:
+    """Cancels a speculative task whose result is not needed, without leaving its exception unretrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
 async def get_territory(territory_id: int, source: str = None, force_recalculate: bool = False) -> dict:
     """
     Main method for retrieving territory data.
@@ -209,16 +228,27 @@ async def get_territory(territory_id: int, source: str = None, force_recalculate
       - If the indicator is not found, it calculates, saves (via PUT), and returns the new result.
 
     If force_recalculate is True, the method always calculates the indicator, saves it via PUT (overwriting the existing value), and returns the new result.
+
+    The calculation is started right away, concurrently with the existence check, and is cancelled
+    if the indicator turns out to exist.
     """
     logger.info(f"Started calculation for territory {territory_id}")
+    compute_task = asyncio.create_task(get_territory_renovation_potential(territory_id, source=source))
     if not force_recalculate:
-        existing_indicator = await check_urbanization_indicator_exists(territory_id)
+        try:
+            existing_indicator = await check_urbanization_indicator_exists(territory_id)
+        except BaseException:
+            _discard_task(compute_task)
+            raise
         if existing_indicator is not None:
+            _discard_task(compute_task)
             logger.info(f"Indicator already exists in Urban DB, returning existing value")
             return existing_indicator
 
     logger.info(f"Recalculating indicator for territory {territory_id} (either forced or not found)")
-    landuse_polygons = await get_territory_renovation_potential(territory_id, source=source)
-    computed_indicator = await compute_urbanization_indicator(landuse_polygons, territory_id)
+    landuse_polygons, landuse_polygons_utm = await compute_task
+    computed_indicator = await compute_urbanization_indicator(
+        landuse_polygons_utm if landuse_polygons_utm is not None else landuse_polygons, territory_id
+    )
     saved_indicator = await put_indicator_value(computed_indicator)
     return saved_indicator
@@ -1,16 +1,60 @@
 import asyncio
+import functools
+import time
+from collections.abc import AsyncIterator
+from itertools import chain
 
-import pandas as pd
 from loguru import logger
 
 from landuse_app import config
 from landuse_app.exceptions.http_exception_wrapper import http_exception
-from landuse_app.logic.api import urban_db_api
+from landuse_app.logic.api import SharedTask, urban_db_api
 
 
+_LOOKUP_TTL = 300
+_MAX_CONCURRENT_PAGES = int(config.get("MAX_CONCURRENT_PAGES") or 32)
+_PHYSICAL_OBJECTS_PAGE_ENDPOINT = "/api/v1/territory/{territory_id}/physical_objects_with_geometry"
+
+
+def _async_ttl_cache(ttl: float, maxsize: int = 1024):
+    """
+    Memoizes a coroutine function by its arguments for ttl seconds.
+
+    Concurrent calls with the same arguments share one in-flight task, which is cancelled only when all of
+    them are. Failed and cancelled calls are not cached.
+    The decorated function gets a cache_clear() method.
+    """
+    def decorator(func):
+        cache: dict[tuple, tuple[float, SharedTask]] = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = cache.get(key)
+            if cached is None or now - cached[0] > ttl or cached[1].abandoned:
+                if len(cache) >= maxsize:
+                    cache.clear()
+                shared = SharedTask(func(*args, **kwargs))
+
+                def _forget_failed(t: asyncio.Task, shared: SharedTask = shared) -> None:
+                    if (t.cancelled() or t.exception() is not None) and cache.get(key, (0, None))[1] is shared:
+                        del cache[key]
+
+                shared.task.add_done_callback(_forget_failed)
+                cached = cache[key] = (now, shared)
+            return await cached[1].wait()
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+@_async_ttl_cache(ttl=_LOOKUP_TTL)
 async def get_projects_territory(project_id: int) -> dict:
     """
-    Fetches the territory information for a project.
+    Fetches the territory information for a project. Results are memoized for _LOOKUP_TTL seconds.
 
     Parameters:
     project_id (int): ID of the project.
@@ -19,9 +63,6 @@ async def get_projects_territory(project_id: int) -> dict:
     dict: Territory information.
     """
     endpoint = f"/api/v1/projects/{project_id}/territory"
-    headers = {
-        "Authorization": f"Bearer {config.get("ACCESS_TOKEN")}"""
-    }
     response = await urban_db_api.get(endpoint)
 
     if not response:
@@ -30,6 +71,7 @@ async def get_projects_territory(project_id: int) -> dict:
     return response
 
 
+@_async_ttl_cache(ttl=_LOOKUP_TTL)
 async def get_projects_base_scenario_id(project_id: int) -> int:
     """
     Fetches the base scenario ID for a project.
@@ -43,11 +85,13 @@ async def get_projects_base_scenario_id(project_id: int) -> int:
     endpoint = f"/api/v1/projects/{project_id}/scenarios"
     scenarios = await urban_db_api.get(endpoint)
 
-    for scenario in scenarios:
-        if scenario.get("is_based"):
-            return scenario.get("scenario_id")
+    scenario_id = next((s.get("scenario_id") for s in scenarios or [] if s.get("is_based")), None)
+    if scenario_id is None:
+        raise http_exception(404, "No base scenario found for the given project ID", project_id)
+    return scenario_id
 
 
+@_async_ttl_cache(ttl=_LOOKUP_TTL)
 async def get_functional_zone_sources(scenario_id: int, source: str = None) -> dict:
     """
     Fetch available functional zone sources for a given scenario ID and determine the best source.
@@ -68,16 +112,26 @@ async def get_functional_zone_sources(scenario_id: int, source: str = None) -> d
     if not response:
         raise http_exception(404, f"No functional zone sources found for the given scenario ID", scenario_id)
 
+    return _select_source(response, source)
+
+
+def _select_source(sources: list[dict], source: str = None) -> dict:
+    """
+    Returns the requested source from the available ones, or the most relevant one if no source is requested.
+
+    Raises:
+    http_exception: If the requested source is not available.
+    """
     if source:
-        source_data = next((s for s in response if s["source"] == source), None)
+        source_data = next((s for s in sources if s["source"] == source), None)
         if not source_data:
             raise http_exception(404, f"No data found for the specified source", source)
         return source_data
 
-    return await _form_source_params(response)
+    return _form_source_params(sources)
 
 
-async def _form_source_params(sources: list[dict]) -> dict:
+def _form_source_params(sources: list[dict]) -> dict:
     """
     Determine the most relevant functional zone source from the available sources.
 
@@ -90,33 +144,43 @@ async def _form_source_params(sources: list[dict]) -> dict:
     if len(sources) == 1:
         return sources[0]
 
-    source_names = [i["source"] for i in sources]
-    source_data_df = pd.DataFrame(sources)
-
-    if "OSM" in source_names:
-        return source_data_df.loc[
-            source_data_df[source_data_df["source"] == "OSM"]["year"].idxmax()
-        ].to_dict()
-
-    # if "OSM" in source_names:
-    #     osm_df = source_data_df[source_data_df["source"] == "OSM"]
-    #     if 2024 in osm_df["year"].values:
-    #         chosen = osm_df[osm_df["year"] == 2024].iloc[0]
-    #     else:
-    #         chosen = osm_df[osm_df["year"] < 2025].sort_values("year", ascending=False).iloc[0]
-    #     return chosen.to_dict()
-
-    elif "PZZ" in source_names:
-        return source_data_df.loc[
-            source_data_df[source_data_df["source"] == "PZZ"]["year"].idxmax()
-        ].to_dict()
-    else:
-        return source_data_df.loc[
-            source_data_df[source_data_df["source"] == "User"]["year"].idxmax()
-        ].to_dict()
+    latest = {}
+    for s in sources:
+        current = latest.get(s["source"])
+        if current is None or s["year"] > current["year"]:
+            latest[s["source"]] = s
+
+    for preferred in ("OSM", "PZZ", "User"):
+        if preferred in latest:
+            return latest[preferred]
+
+    raise http_exception(404, "No supported functional zone source found", [s["source"] for s in sources])
+
+
+async def _resolve_scenario_and_source(project_id: int, source: str = None,
+                                       scenario_id: int | None = None) -> tuple[int, dict]:
+    """
+    Resolves the base scenario of a project and the functional zone source to use for it.
+
+    Parameters:
+    project_id (int): ID of the project.
+    source (str, optional): The preferred source (PZZ or OSM). If not provided, the best source is selected automatically.
+    scenario_id (int, optional): Base scenario ID if the caller already knows it, the lookup is skipped then.
+
+    Returns:
+    tuple[int, dict]: Base scenario ID and the source data with 'source' and 'year'.
+    """
+    base_scenario_id = scenario_id if scenario_id is not None else await get_projects_base_scenario_id(project_id)
+    source_data = await get_functional_zone_sources(base_scenario_id, source)
+
+    if not source_data or "source" not in source_data or "year" not in source_data:
+        raise http_exception(404, "No valid source found for the given project ID", project_id)
+
+    return base_scenario_id, source_data
 
 
-async def get_functional_zones_scenario_id(project_id: int, is_context: bool = False, source: str = None) -> dict:
+async def get_functional_zones_scenario_id(project_id: int, is_context: bool = False, source: str = None,
+                                           *, scenario_id: int | None = None) -> dict:
     """
     Fetches functional zones for a project with an optional context flag and source selection.
 
@@ -124,6 +188,7 @@ async def get_functional_zones_scenario_id(project_id: int, is_context: bool = F
     project_id (int): ID of the project.
     is_context (bool): Flag to determine if context data should be fetched. Default is False.
     source (str, optional): The preferred source (PZZ or OSM). If not provided, the best source is selected automatically.
+    scenario_id (int, optional): Base scenario ID if the caller already knows it, the lookup is skipped then.
 
     Returns:
     dict: Response data from the API.
@@ -131,35 +196,33 @@ async def get_functional_zones_scenario_id(project_id: int, is_context: bool = F
     Raises:
     http_exception: If the response is empty or the specified source is not available.
     """
-    base_scenario_id = await get_projects_base_scenario_id(project_id)
-    source_data = await get_functional_zone_sources(base_scenario_id, source)
-
-    if not source_data or "source" not in source_data or "year" not in source_data:
-        raise http_exception(404, "No valid source found for the given project ID", project_id)
-
+    base_scenario_id, source_data = await _resolve_scenario_and_source(project_id, source, scenario_id)
     source = source_data["source"]
     year = source_data["year"]
 
     endpoint = (
-        f"/api/v1/projects/{project_id}/context/functional_zones?year={year}&source={source}"
+        f"/api/v1/projects/{project_id}/context/functional_zones"
         if is_context
-        else f"/api/v1/scenarios/{base_scenario_id}/functional_zones?year={year}&source={source}"
+        else f"/api/v1/scenarios/{base_scenario_id}/functional_zones"
     )
 
-    response = await urban_db_api.get(endpoint)
+    response = await urban_db_api.get(endpoint, params={"year": year, "source": source}, use_etag=True)
     if not response or "features" not in response or not response["features"]:
         raise http_exception(404, "No functional zones found for the given project ID", project_id)
 
     return response
 
 
-async def get_all_physical_objects_geometries(project_id: int, is_context: bool = False) -> dict:
+async def get_all_physical_objects_geometries(project_id: int, is_context: bool = False,
+                                              *, scenario_id: int | None = None) -> dict:
     """
     Fetches all physical object geometries for a project, optionally for context.
 
     Parameters:
         project_id (int): ID of the project.
         is_context (bool): Whether to fetch context geometries.
+        scenario_id (int, optional): Base scenario ID if the caller already knows it, the lookup is skipped then.
+            Context geometries are requested by project and need no scenario at all.
 
     Returns:
         dict: The API response containing geometries.
@@ -167,17 +230,15 @@ async def get_all_physical_objects_geometries(project_id: int, is_context: bool
     Raises:
         http_exception: If the response is empty.
     """
-    base_scenario_id = await get_projects_base_scenario_id(project_id)
-
-    endpoint = (
-        f"/api/v1/projects/{project_id}/context/geometries_with_all_objects"
-        if is_context
-        else f"/api/v1/scenarios/{base_scenario_id}/geometries_with_all_objects"
-    )
+    if is_context:
+        endpoint = f"/api/v1/projects/{project_id}/context/geometries_with_all_objects"
+    else:
+        if scenario_id is None:
+            scenario_id = await get_projects_base_scenario_id(project_id)
+        endpoint = f"/api/v1/scenarios/{scenario_id}/geometries_with_all_objects"
 
-    try:
-        response = await urban_db_api.get(endpoint)
-    except Exception:
+    response = await urban_db_api.get(endpoint, ignore_404=True, use_etag=True)
+    if response is None:
         raise http_exception(404, "No geometries found for the given project ID:", project_id)
 
     return response
@@ -186,7 +247,9 @@ async def get_all_physical_objects_geometries(project_id: int, is_context: bool
 async def get_all_physical_objects_geometries_type_id(project_id: int, object_type_id: int) -> dict:
     base_scenario_id = await get_projects_base_scenario_id(project_id)
     return await urban_db_api.get(
-        f"/api/v1/scenarios/{base_scenario_id}/geometries_with_all_objects?physical_object_type_id={object_type_id}"
+        f"/api/v1/scenarios/{base_scenario_id}/geometries_with_all_objects",
+        params={"physical_object_type_id": object_type_id},
+        use_etag=True
     )
 
 
@@ -212,8 +275,8 @@ async def get_functional_zones_scen_id_percentages(scenario_id: int, source: str
     source = source_data["source"]
     year = source_data["year"]
 
-    endpoint = f"/api/v1/scenarios/{scenario_id}/functional_zones?year={year}&source={source}"
-    response = await urban_db_api.get(endpoint)
+    endpoint = f"/api/v1/scenarios/{scenario_id}/functional_zones"
+    response = await urban_db_api.get(endpoint, params={"year": year, "source": source}, use_etag=True)
 
     if not response or "features" not in response or not response["features"]:
         raise http_exception(404, "No functional zones found for the given scenario ID", scenario_id)
@@ -234,7 +297,7 @@ async def get_all_physical_objects_geometries_scen_id_percentages(scenario_id: i
         http_exception: If the response is empty.
     """
     endpoint = f"/api/v1/scenarios/{scenario_id}/geometries_with_all_objects"
-    response = await urban_db_api.get(endpoint)
+    response = await urban_db_api.get(endpoint, use_etag=True)
 
     if not response or "features" not in response or not response["features"]:
         raise http_exception(404, "No functional zones found for the given scenario ID:", scenario_id)
@@ -242,6 +305,7 @@ async def get_all_physical_objects_geometries_scen_id_percentages(scenario_id: i
     return response
 
 
+@_async_ttl_cache(ttl=_LOOKUP_TTL)
 async def get_functional_zone_sources_territory_id(territory_id: int, source: str = None) -> dict:
     """
         Fetch available functional zone sources for a given scenario ID and determine the best source.
@@ -262,13 +326,7 @@ async def get_functional_zone_sources_territory_id(territory_id: int, source: st
     if not response:
         raise http_exception(404, f"No functional zone sources found for the given territory id ID", territory_id)
 
-    if source:
-        source_data = next((s for s in response if s["source"] == source), None)
-        if not source_data:
-            raise http_exception(404, f"No data found for the specified source", source)
-        return source_data
-
-    return await _form_source_params(response)
+    return _select_source(response, source)
 
 
 async def get_functional_zones_territory_id(territory_id: int, source: str = None, functional_zone_type_id: int = None,
@@ -287,24 +345,7 @@ async def get_functional_zones_territory_id(territory_id: int, source: str = Non
         Raises:
         http_exception: If the response is empty or the specified source is not available.
         """
-    source_data = await get_functional_zone_sources_territory_id(territory_id, source)
-
-    if not source_data or "source" not in source_data or "year" not in source_data:
-        raise http_exception(404, "No valid source found for the given project ID", territory_id)
-
-    source = source_data["source"]
-    year = source_data["year"]
-
-    if functional_zone_type_id:
-        endpoint = (
-            f"/api/v1/territory/{territory_id}/functional_zones?year={year}&source={source}&functional_zone_type_id={functional_zone_type_id}"
-        )
-    else:
-        endpoint = (
-            f"/api/v1/territory/{territory_id}/functional_zones?year={year}&source={source}"
-        )
-
-    response = await urban_db_api.get(endpoint, params=params)
+    response = await get_functional_zones_geojson_territory_id(territory_id, source, functional_zone_type_id, params)
     if not response:
         raise http_exception(404, "No functional zones found for the given project ID", territory_id)
 
@@ -313,27 +354,66 @@ async def get_functional_zones_territory_id(territory_id: int, source: str = Non
 
 async def get_functional_zones_geojson_territory_id(territory_id: int, source: str = None,
                                                     functional_zone_type_id: int = None, params: dict = None) -> dict:
+    """
+    Same as get_functional_zones_territory_id, but returns the response as is, even if it is empty.
+    """
     source_data = await get_functional_zone_sources_territory_id(territory_id, source)
     if not source_data or "source" not in source_data or "year" not in source_data:
         raise http_exception(404, "No valid source found for the given project ID", territory_id)
     source = source_data["source"]
     year = source_data["year"]
+    endpoint = f"/api/v1/territory/{territory_id}/functional_zones"
+    query = {"year": year, "source": source}
     if functional_zone_type_id:
-        endpoint = (
-            f"/api/v1/territory/{territory_id}/functional_zones?year={year}&source={source}&functional_zone_type_id={functional_zone_type_id}"
-        )
-    else:
-        endpoint = (f"/api/v1/territory/{territory_id}/functional_zones?year={year}&source={source}"
-                    )
+        query["functional_zone_type_id"] = functional_zone_type_id
 
-    response = await urban_db_api.get(endpoint, params=params)
+    response = await urban_db_api.get(endpoint, params={**query, **(params or {})}, use_etag=True)
     return response
 
 
-async def get_target_cities(territory_id: int) -> dict:
-    endpoint = f"/api/v1/all_territories_without_geometry?parent_id={territory_id}&page_size=5000&get_all_levels=true&cities_only=true"
-    response = await urban_db_api.get(endpoint)
-    return response
+async def iter_target_cities(territory_id: int, page_size: int = 5000) -> AsyncIterator[dict]:
+    """
+    Yields the cities of a territory (on all levels) as they are loaded.
+
+    A plain list response is yielded as is. A paginated response (with "count" and "results") yields
+    the first page right away, while the remaining pages are requested concurrently, at most
+    MAX_CONCURRENT_PAGES at a time, and yielded in page order.
+
+    Parameters:
+        territory_id (int): ID of the parent territory.
+        page_size (int, optional): The number of cities to request per page (default is 5000).
+    """
+    endpoint = "/api/v1/all_territories_without_geometry"
+    params = {
+        "parent_id": territory_id,
+        "page_size": page_size,
+        "get_all_levels": "true",
+        "cities_only": "true"
+    }
+    response = await urban_db_api.get(endpoint, params=params)
+    if not isinstance(response, dict):
+        for city in response or ():
+            yield city
+        return
+
+    total = response.get("count", 0)
+    total_pages = (total // page_size) + (1 if total % page_size else 0)
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PAGES)
+
+    async def fetch_page_with_sem(page: int) -> dict:
+        async with semaphore:
+            return await urban_db_api.get(endpoint, params={**params, "page": page})
+
+    tasks = [asyncio.create_task(fetch_page_with_sem(page)) for page in range(2, total_pages + 1)]
+    try:
+        for city in response.get("results", ()):
+            yield city
+        for task in tasks:
+            for city in (await task).get("results", ()):
+                yield city
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 async def get_physical_objects_from_territory(territory_id: int) -> dict:
@@ -369,6 +449,21 @@ async def get_physical_objects_without_geometry(territory_id: int, params: dict
     return response
 
 
+_MISSING_INDICATOR_TTL = 30
+_missing_indicators: dict[tuple[int, int], float] = {}
+
+
+def _is_known_missing(territory_id: int, indicator_id: int) -> bool:
+    expires = _missing_indicators.get((territory_id, indicator_id))
+    return expires is not None and expires > time.monotonic()
+
+
+def _remember_missing(territory_id: int, indicator_id: int) -> None:
+    if len(_missing_indicators) >= 4096:
+        _missing_indicators.clear()
+    _missing_indicators[(territory_id, indicator_id)] = time.monotonic() + _MISSING_INDICATOR_TTL
+
+
 async def check_urbanization_indicator_exists(territory_id: int) -> dict | None:
     """
     Attempts to retrieve an existing urbanization indicator from the database.
@@ -377,17 +472,20 @@ async def check_urbanization_indicator_exists(territory_id: int) -> dict | None:
       - dict: The indicator JSON if the response status is 200.
       - None: If the response status is 404 (i.e., the indicator does not exist).
     """
-    endpoint = (
-        f"/api/v1/territory/{territory_id}/indicator_values"
-        "?indicator_id=16"
-        f"&territory_id={territory_id}"
-        "&date_type=year"
-        "&date_value=2025-01-01"
-        "&value_type=forecast"
-        "&information_source=landuse_det"
-    )
-    data = await urban_db_api.get(endpoint, ignore_404=True)
+    endpoint = f"/api/v1/territory/{territory_id}/indicator_values"
+    params = {
+        "indicator_id": 16,
+        "territory_id": territory_id,
+        "date_type": "year",
+        "date_value": "2025-01-01",
+        "value_type": "forecast",
+        "information_source": "landuse_det"
+    }
+    if _is_known_missing(territory_id, 16):
+        return None
+    data = await urban_db_api.get(endpoint, params=params, ignore_404=True, use_etag=True)
     if not data:
+        _remember_missing(territory_id, 16)
         return None
     return data
 
@@ -400,26 +498,26 @@ async def check_indicator_exists(territory_id: int, indicator_id: int) -> dict |
       - dict: The indicator JSON if the response status is 200.
       - None: If the response status is 404 (i.e., the indicator does not exist).
     """
-    endpoint = (
-        f"/api/v1/territory/{territory_id}/indicator_values"
-        f"?indicator_ids={indicator_id}"
-        "&date_type=year"
-        "&date_value=2025-01-01"
-        "&value_type=real"
-        "&information_source=modeled"
-    )
-    data = await urban_db_api.get(endpoint, ignore_404=True)
+    endpoint = f"/api/v1/territory/{territory_id}/indicator_values"
+    params = {
+        "indicator_ids": indicator_id,
+        "date_type": "year",
+        "date_value": "2025-01-01",
+        "value_type": "real",
+        "information_source": "modeled"
+    }
+    if _is_known_missing(territory_id, indicator_id):
+        return None
+    data = await urban_db_api.get(endpoint, params=params, ignore_404=True, use_etag=True)
     if not data:
+        _remember_missing(territory_id, indicator_id)
         return None
     return data
 
 
 async def get_indicator_values(territory_id: int, indicator_id: int, params: dict = None) -> dict | None:
-    endpoint = (
-        f"/api/v1/territory/{territory_id}/indicator_values"
-        f"?indicator_ids={indicator_id}"
-    )
-    response = await urban_db_api.get(endpoint, params=params)
+    endpoint = f"/api/v1/territory/{territory_id}/indicator_values"
+    response = await urban_db_api.get(endpoint, params={"indicator_ids": indicator_id, **(params or {})})
     if not response:
         return None
     return response
@@ -448,18 +546,21 @@ async def put_indicator_value(indicator_data: dict) -> dict:
       http_exception: If the response status code is not 200 or 201.
     """
     endpoint = "/api/v1/indicator_value"
-    return await urban_db_api.put(endpoint, data=indicator_data)
+    response = await urban_db_api.put(endpoint, data=indicator_data)
+    _missing_indicators.pop((indicator_data.get("territory_id"), indicator_data.get("indicator_id")), None)
+    return response
 
 
 async def get_physical_objects_from_territory_parallel(territory_id: int,
                                                        page_size: int = int(config.get("PAGE_SIZE"))) -> list[dict]:
     """
-    Fetch physical objects from a territory in parallel with a concurrency limit of 5.
+    Fetch physical objects from a territory in parallel with a concurrency limit of MAX_CONCURRENT_PAGES.
 
     This asynchronous function retrieves all physical objects for a given territory using the
     endpoint /territory/{territory_id}/physical_objects_with_geometry. It paginates through the results
     based on the provided page_size and uses the get() method from urban_db_api
-    to make API requests. The function limits concurrent requests to 5.
+    to make API requests. The first page gives the total count and is reused, the remaining pages
+    are requested concurrently, at most MAX_CONCURRENT_PAGES (default 32) at a time.
 
     Parameters:
         territory_id (int): The unique identifier of the territory.
@@ -468,31 +569,26 @@ async def get_physical_objects_from_territory_parallel(territory_id: int,
     Returns:
         list[dict]: A list of dictionaries, where each dictionary represents a physical object.
     """
-    endpoint = f"/api/v1/territory/{territory_id}/physical_objects_with_geometry?page=1&page_size={page_size}"
-    initial_response = await urban_db_api.get(endpoint)
+    started = time.perf_counter()
+    endpoint = _PHYSICAL_OBJECTS_PAGE_ENDPOINT.format(territory_id=territory_id)
+    initial_response = await urban_db_api.get(endpoint, params={"page": 1, "page_size": page_size})
     total = initial_response.get("count", 0)
     total_pages = (total // page_size) + (1 if total % page_size else 0)
     logger.info(f"Total physical objects on territory: {total}, Total number of pages: {total_pages}")
 
-    urls = [
-        f"/api/v1/territory/{territory_id}/physical_objects_with_geometry?page={i}&page_size={page_size}"
-        for i in range(1, total_pages + 1)
-    ]
-
-    semaphore = asyncio.Semaphore(5)
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PAGES)
 
-    async def fetch_page_with_sem(url: str) -> dict:
+    async def fetch_page_with_sem(page: int) -> dict:
         async with semaphore:
-            data = await urban_db_api.get(url)
-            logger.info(f"Page {url} has been loaded")
+            data = await urban_db_api.get(endpoint, params={"page": page, "page_size": page_size})
+            logger.debug("Page {} of {} has been loaded", page, endpoint)
             return data
 
-    tasks = [fetch_page_with_sem(url) for url in urls]
-    pages = await asyncio.gather(*tasks)
+    tasks = [fetch_page_with_sem(page) for page in range(2, total_pages + 1)]
+    pages = [initial_response, *await asyncio.gather(*tasks)]
+    results = list(chain.from_iterable(page.get("results", ()) for page in pages))
+    logger.info(f"Fetched {total_pages} pages, {len(results)} physical objects in {time.perf_counter() - started:.2f}s")
 
-    results = []
-    for page in pages:
-        results.extend(page.get("results", []))
     return results
 
 
@@ -529,27 +625,23 @@ async def get_service_count(territory_id: int, service_type_id: int) -> int:
 
 
 async def get_services_geojson(territory_id: int, service_type_id: int, params: dict = None) -> dict:
-    endpoint = f"/api/v1/territory/{territory_id}/services_geojson?service_type_id={service_type_id}"
-    response = await urban_db_api.get(endpoint, params=params)
+    endpoint = f"/api/v1/territory/{territory_id}/services_geojson"
+    response = await urban_db_api.get(endpoint, params={"service_type_id": service_type_id, **(params or {})})
     if not response:
         raise http_exception(404, "No services found for given territory ID:", territory_id)
     return response
 
 
-async def check_project_indicator_exist(project_id: int, indicator_id: int) -> dict | None:
+async def check_scenario_indicator_exist(scenario_id: int, indicator_id: int) -> dict | None:
     """
-    Attempts to retrieve an existing indicator from the database.
+    Attempts to retrieve an existing indicator of the scenario from the database.
 
     Returns:
       - dict: The indicator JSON if the response status is 200.
       - None: If the response status is 404 (i.e., the indicator does not exist).
     """
-    scenario_id = await get_projects_base_scenario_id(project_id)
-    endpoint = (
-        f"/api/v1/scenarios/{scenario_id}/indicators_values"
-        f"?indicator_ids={indicator_id}"
-    )
-    data = await urban_db_api.get(endpoint, ignore_404=True)
+    endpoint = f"/api/v1/scenarios/{scenario_id}/indicators_values"
+    data = await urban_db_api.get(endpoint, params={"indicator_ids": indicator_id}, ignore_404=True, use_etag=True)
     if not data:
         return None
     return data
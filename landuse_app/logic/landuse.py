@@ -1,7 +1,5 @@
 """Landuse handlers logic."""
 
-from landuse_app.schemas import GeoJSON
-
 from .helpers import (
     get_projects_context_renovation_potential,
     get_projects_context_urbanization_level,
@@ -19,7 +17,7 @@ class LanduseService:
         """Calculate renovation potential for project."""
         return await get_projects_renovation_potential(project_id, source)
 
-    async def get_urbanization_level(self, project_id: int, source: str = None) -> GeoJSON:
+    async def get_urbanization_level(self, project_id: int, source: str = None) -> dict:
         """Calculate urbanization level for project."""
         return await get_projects_urbanization_level(project_id, source)
 
@@ -27,7 +25,7 @@ class LanduseService:
         """Calculate renovation potential for project's context."""
         return await get_projects_context_renovation_potential(project_id, source)
 
-    async def get_context_urbanization_level(self, project_id: int, source: str = None) -> GeoJSON:
+    async def get_context_urbanization_level(self, project_id: int, source: str = None) -> dict:
         """Calculate urbanization level for project's context."""
         return await get_projects_context_urbanization_level(project_id, source)
 
@@ -3,10 +3,55 @@
 from typing import Any, Literal
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from geojson_pydantic import Feature, FeatureCollection
 from shapely.geometry import mapping
 
 
+def _polygons_to_geojson(polygons: np.ndarray) -> list[dict[str, Any]]:
+    rings, polygon_index = shapely.get_rings(polygons, return_index=True)
+    coordinates = shapely.get_coordinates(rings).tolist()
+    ring_ends = np.cumsum(shapely.get_num_coordinates(rings)).tolist()
+    polygon_ends = np.cumsum(np.bincount(polygon_index, minlength=len(polygons))).tolist()
+
+    ring_coordinates, start = [], 0
+    for end in ring_ends:
+        ring_coordinates.append(tuple(map(tuple, coordinates[start:end])))
+        start = end
+
+    result, start = [], 0
+    for end in polygon_ends:
+        result.append({"type": "Polygon", "coordinates": tuple(ring_coordinates[start:end])})
+        start = end
+    return result
+
+
+def _geometries_to_geojson(geometries) -> list[dict[str, Any]]:
+    """
+    Same as shapely.geometry.mapping for each geometry. Coordinates of 2D points and polygons are taken
+    for all of them at once with shapely.get_coordinates, other geometries go through mapping.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    result: list[Any] = [None] * len(geometries)
+    if len(geometries):
+        type_ids = shapely.get_type_id(geometries)
+        simple = ~shapely.has_z(geometries) & ~shapely.is_empty(geometries)
+
+        points = np.flatnonzero(simple & (type_ids == shapely.GeometryType.POINT))
+        for i, xy in zip(points.tolist(), shapely.get_coordinates(geometries[points]).tolist()):
+            result[i] = {"type": "Point", "coordinates": tuple(xy)}
+
+        polygons = np.flatnonzero(simple & (type_ids == shapely.GeometryType.POLYGON))
+        for i, geometry in zip(polygons.tolist(), _polygons_to_geojson(geometries[polygons])):
+            result[i] = geometry
+
+    for i, geometry in enumerate(result):
+        if geometry is None:
+            result[i] = mapping(geometries[i])
+    return result
+
+
 class GeoJSON(FeatureCollection):
     type: Literal["FeatureCollection"] = "FeatureCollection"
 
@@ -16,18 +61,37 @@ class GeoJSON(FeatureCollection):
 
     @classmethod
     def from_features_list(cls, features: list[dict[str, Any]]) -> "GeoJSON":
-        feature_collection = []
-        for feature in features:
-            properties = dict(feature)
-            geometry = properties.pop("geometry", None)
-            feature_collection.append(Feature(type="Feature", geometry=geometry, properties=properties))
-        return cls(features=feature_collection)
+        return cls(features=[
+            Feature(
+                type="Feature",
+                geometry=feature.get("geometry"),
+                properties={key: value for key, value in feature.items() if key != "geometry"}
+            )
+            for feature in features
+        ])
 
     @classmethod
     def from_geodataframe(cls, gdf: gpd.GeoDataFrame) -> "GeoJSON":
-        feature_collection = []
-        for _, row in gdf.iterrows():
-            geometry = mapping(row.geometry)
-            properties = row.drop("geometry").to_dict()
-            feature_collection.append(Feature(type="Feature", geometry=geometry, properties=properties))
-        return cls(features=feature_collection)
+        geometries = _geometries_to_geojson(gdf.geometry.values)
+        properties = gdf.drop(columns="geometry").to_dict(orient="records")
+        return cls(features=[
+            Feature(type="Feature", geometry=geometry, properties=props)
+            for geometry, props in zip(geometries, properties)
+        ])
+
+    @staticmethod
+    def dict_from_geodataframe(gdf: gpd.GeoDataFrame) -> dict[str, Any]:
+        """
+        Builds the same FeatureCollection as from_geodataframe as plain dicts, without pydantic models,
+        for responses that are serialized directly. Missing property values become None.
+        """
+        properties = gdf.drop(columns="geometry").astype(object)
+        properties = properties.where(properties.notna(), None)
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": geometry, "properties": props}
+                for geometry, props in zip(_geometries_to_geojson(gdf.geometry.values),
+                                           properties.to_dict(orient="records"))
+            ],
+        }
@@ -1,88 +1,216 @@
-import json
+import functools
+import os
+import pickle
 import re
-from datetime import datetime, timedelta
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
+import geopandas as gpd
+import orjson
 from loguru import logger
 
 from landuse_app import config
 
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*&]')
+
+
+@functools.lru_cache(maxsize=1024)
+def _param_string(items: tuple) -> str:
+    return "_".join(f"{k}-{v}" for k, v in items)
+
 
 class CachingService:
     def __init__(self, cache_path: Path, cache_enabled: bool = True):
         self.cache_enabled = cache_enabled
         self.refresh_days: int = 3
+        # recently used JSON payloads, so hot keys skip both the disk read and the parsing
+        self.memory_ttl: float = 60.0
+        self.memory_size: int = 128
+        self._memory: OrderedDict[Path, tuple[float, dict]] = OrderedDict()
         if self.cache_enabled:
             self.cache_path = cache_path
-            self.cache_path.mkdir(parents=True, exist_ok=True)
+            if not self.cache_path.is_dir():
+                self.cache_path.mkdir(parents=True, exist_ok=True)
         else:
             self.cache_path = None
 
     def _sanitize_filename(self, name: str) -> str:
-        return re.sub(r'[<>:"/\\|?*&]', "", name)
+        return _SANITIZE_RE.sub("", name)
 
-    def get_cache_file_path(self, name: str, params: dict) -> Path:
+    def get_cache_file_path(self, name: str, params: dict, suffix: str = ".json") -> Path:
+        """
+        Returns the cache file for the name and params. The file name is deterministic, so each key
+        has a single file which is overwritten on save, and its freshness is the file's mtime.
+        """
         if not self.cache_enabled:
             return None
         sanitized_name = self._sanitize_filename(name)
-        param_string = "_".join([f"{k}-{v}" for k, v in sorted(params.items())])
-        date = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-        return self.cache_path / f"{date}_{sanitized_name}_{param_string}.json"
+        return self.cache_path / f"{sanitized_name}_{_param_string(tuple(sorted(params.items())))}{suffix}"
 
-    def is_cache_valid(self, file_path: Path) -> bool:
-        if not self.cache_enabled or not file_path or not file_path.exists():
+    def is_cache_valid(self, file_path: Path | os.DirEntry, stale_before: float | None = None) -> bool:
+        """
+        Accepts a DirEntry too. stale_before is the _stale_before() threshold, callers checking many files
+        compute it once and pass it in.
+        """
+        if not self.cache_enabled or not file_path:
+            return False
+        if stale_before is None:
+            stale_before = self._stale_before()
+        try:
+            return file_path.stat().st_mtime > stale_before
+        except FileNotFoundError:
             return False
-        file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-        return datetime.now() - file_time < timedelta(days=self.refresh_days)
 
-    def save_cache(self, data: dict, file_path: Path) -> None:
+    def _stale_before(self) -> float:
+        """Files modified before this timestamp are stale."""
+        return time.time() - self.refresh_days * 86400
+
+    def save_cache(self, data: dict | bytes, file_path: Path) -> None:
+        """
+        The file is written to a temporary file in the cache directory and then moved over the old one,
+        so readers never see a half-written cache file, even if the process dies mid-write.
+        """
         if not self.cache_enabled or not file_path:
             return
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            body = data if isinstance(data, bytes) else orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            self._write_atomic(body, file_path)
+            self._memory.pop(file_path, None)
         except Exception as e:
             logger.warning(f"Ошибка при сохранении кэша в {file_path}: {e}")
 
+    @staticmethod
+    def _write_atomic(body: bytes, file_path: Path) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(body)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _remember(self, file_path: Path, data: dict) -> None:
+        now = time.monotonic()
+        for expired in [path for path, (expires_at, _) in self._memory.items() if expires_at <= now]:
+            del self._memory[expired]
+        self._memory[file_path] = (now + self.memory_ttl, data)
+        self._memory.move_to_end(file_path)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
     def load_cache(self, file_path: Path) -> dict:
-        if not self.cache_enabled or not file_path or not file_path.exists():
+        """
+        Loads a JSON payload. Payloads loaded within the last memory_ttl seconds are served
+        from memory; the same object is returned to every caller, so it must not be modified.
+        """
+        if not self.cache_enabled or not file_path:
+            return {}
+        cached = self._memory.get(file_path)
+        # served without copying: callers of UrbanDbAPI.get share the payload and must treat it as read-only
+        if cached is not None and cached[0] > time.monotonic():
+            self._memory.move_to_end(file_path)
+            return cached[1]
+        if not file_path.exists():
             return {}
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            data = orjson.loads(file_path.read_bytes())
+            self._remember(file_path, data)
+            return data
         except Exception as e:
             logger.warning(f"Ошибка при загрузке кэша из {file_path}: {e}")
             return {}
 
-    def get_recent_cache_file(self, name: str, params: dict) -> Path:
+    def get_recent_cache_file(self, name: str, params: dict, suffix: str = ".json") -> Path:
         if not self.cache_enabled:
             return None
-        sanitized_name = self._sanitize_filename(name)
-        param_string = "_".join([f"{k}-{v}" for k, v in sorted(params.items())])
-        pattern = f"*_{sanitized_name}_{param_string}.json"
-        matching_files = sorted(self.cache_path.glob(pattern), reverse=True)
-        return matching_files[0] if matching_files else None
+        file_path = self.get_cache_file_path(name, params, suffix)
+        return file_path if file_path.exists() else None
 
-    def clean_cache(self, name: str, params: dict) -> None:
+    def clean_cache(self, name: str, params: dict, suffix: str = ".json") -> None:
         if not self.cache_enabled:
             return
-        sanitized_name = self._sanitize_filename(name)
-        param_string = "_".join([f"{k}-{v}" for k, v in sorted(params.items())])
-        pattern = f"*_{sanitized_name}_{param_string}.json"
-        matching_files = self.cache_path.glob(pattern)
-        for file in matching_files:
-            if not self.is_cache_valid(file):
-                logger.info(f"Удаление устаревшего кэш-файла: {file}")
-                try:
-                    file.unlink()
-                except Exception as e:
-                    logger.warning(f"Ошибка при удалении файла {file}: {e}")
-
-    def save_with_cleanup(self, data: dict, name: str, params: dict) -> None:
+        file_path = self.get_cache_file_path(name, params, suffix)
+        if file_path.exists() and not self.is_cache_valid(file_path):
+            logger.info(f"Удаление устаревшего кэш-файла: {file_path}")
+            self._memory.pop(file_path, None)
+            try:
+                file_path.unlink()
+            except Exception as e:
+                logger.warning(f"Ошибка при удалении файла {file_path}: {e}")
+
+    def sweep_all(self, max_workers: int = 8) -> int:
+        """
+        Deletes every stale file in the cache directory, including leftovers of interrupted writes,
+        and returns how many were deleted. The directory is scanned once and the deletions run in a
+        thread pool, since unlink is pure syscall latency.
+        """
+        if not self.cache_enabled or not self.cache_path.is_dir():
+            return 0
+        stale_before = self._stale_before()
+        try:
+            with os.scandir(self.cache_path) as entries:
+                stale = [
+                    entry.path for entry in entries
+                    if entry.is_file(follow_symlinks=False) and not self.is_cache_valid(entry, stale_before)
+                ]
+        except OSError as e:
+            logger.warning(f"Ошибка при очистке кэша в {self.cache_path}: {e}")
+            return 0
+        if not stale:
+            return 0
+
+        def unlink(path: str) -> bool:
+            try:
+                os.unlink(path)
+                return True
+            except FileNotFoundError:
+                return False
+            except OSError as e:
+                logger.warning(f"Ошибка при удалении файла {path}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            removed = sum(executor.map(unlink, stale))
+        logger.info(f"Удалено устаревших кэш-файлов: {removed}")
+        return removed
+
+    def save_with_cleanup(self, data: dict | bytes, name: str, params: dict) -> None:
+        # the stale file, if any, is simply overwritten
         if not self.cache_enabled:
             return
-        self.clean_cache(name, params)
         file_path = self.get_cache_file_path(name, params)
         self.save_cache(data, file_path)
 
+    def save_geodataframe(self, gdf: gpd.GeoDataFrame, name: str, params: dict) -> None:
+        """
+        Caches a GeoDataFrame in binary form: attribute columns are stored as is and geometries
+        as WKB, so loading it back needs neither JSON parsing nor GeoJSON geometry reconstruction.
+        """
+        if not self.cache_enabled:
+            return
+        file_path = self.get_cache_file_path(name, params, suffix=".pkl")
+        payload = {
+            "crs": gdf.crs.to_wkt() if gdf.crs else None,
+            "geometry": gdf.geometry.name,
+            "data": gdf.to_wkb(),
+        }
+        self.save_cache(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), file_path)
+
+    def load_geodataframe(self, file_path: Path) -> gpd.GeoDataFrame | None:
+        if not self.cache_enabled or not file_path or not file_path.exists():
+            return None
+        try:
+            payload = pickle.loads(file_path.read_bytes())
+            data, geometry_name = payload["data"], payload["geometry"]
+            data[geometry_name] = gpd.GeoSeries.from_wkb(data[geometry_name])
+            return gpd.GeoDataFrame(data, geometry=geometry_name, crs=payload["crs"])
+        except Exception as e:
+            logger.warning(f"Ошибка при загрузке кэша из {file_path}: {e}")
+            return None
+
 cache_enabled = config.get_bool("CACHE_ENABLED")  # должен вернуть True или False
 caching_service = CachingService(Path().absolute() / "__landuse_cache__", cache_enabled)
\ No newline at end of file
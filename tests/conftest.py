@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# the app reads its settings from the environment on import
+os.environ.setdefault("PAGE_SIZE", "1000")
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.gettempdir(), "landuse_det_tests"))
@@ -0,0 +1,37 @@
+import asyncio
+
+from shapely.geometry import box, mapping
+
+from landuse_app.logic.helpers import preprocessing_service
+from landuse_app.logic.helpers.preprocessing_service import PreProcessingService
+
+
+def test_territory_objects_without_physical_object_id(monkeypatch):
+    raw_objects = [
+        {"geometry": mapping(box(30.0, 60.0, 30.001, 60.001)), "physical_object_type": {"name": "Здание"}},
+        {"geometry": mapping(box(30.01, 60.0, 30.011, 60.001))},
+    ]
+
+    async def fake_objects(territory_id):
+        return raw_objects
+
+    monkeypatch.setattr(preprocessing_service, "get_physical_objects_from_territory_parallel", fake_objects)
+
+    result = asyncio.run(PreProcessingService.extract_physical_objects_from_territory(1))
+
+    physical_objects = result["physical_objects"]
+    assert len(physical_objects) == 1
+    assert physical_objects["object_type"].tolist() == ["Здание"]
+    assert physical_objects.crs.is_projected
+
+
+def test_building_levels_are_truncated_like_int():
+    raw_objects = [
+        {"geometry": mapping(box(30.0, 60.0, 30.001, 60.001)),
+         "building": {"properties": {"osm_data": {"building:levels": levels}}}}
+        for levels in (3.5, "4", 0.4)
+    ]
+
+    physical_objects = PreProcessingService.parse_physical_objects(raw_objects)
+
+    assert physical_objects["storeys_count"].tolist() == [3, 4, 1]
@@ -0,0 +1,42 @@
+import geopandas as gpd
+from shapely.geometry import Point, box
+
+from landuse_app.logic.helpers.renovation_potential import mark_protected_area_zones
+
+
+def make_zones() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "functional_zone_id": [1, 2, 1],
+            "Потенциал": ["Подлежащие реновации", "Подлежащие реновации", None],
+            "Уровень урбанизации": ["Мало урбанизированная территория"] * 3,
+        },
+        geometry=[box(0, 0, 10, 10), box(20, 0, 30, 10), box(40, 0, 50, 10)],
+        crs=32637,
+    )
+
+
+def test_protected_area_marks_touched_zone_and_zones_with_same_id():
+    objects = gpd.GeoDataFrame(
+        {"service_id": [4, 7]},
+        geometry=[Point(5, 5), Point(25, 5)],
+        crs=32637,
+    )
+
+    zones = mark_protected_area_zones(make_zones(), objects)
+
+    assert zones["Потенциал"].tolist() == [
+        "Не подлежащие реновации", "Подлежащие реновации", "Не подлежащие реновации"
+    ]
+    marked = zones["Процент урбанизации"]
+    assert marked[[0, 2]].tolist() == ["Высоко урбанизированная территория"] * 2
+    assert marked.isna()[1]
+    assert zones["Уровень урбанизации"].tolist() == ["Мало урбанизированная территория"] * 3
+
+
+def test_no_protected_areas_leaves_zones_unchanged():
+    objects = gpd.GeoDataFrame({"service_id": [4]}, geometry=[Point(100, 100)], crs=32637)
+
+    zones = mark_protected_area_zones(make_zones(), objects)
+
+    assert zones.equals(make_zones())